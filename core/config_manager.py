@@ -8,15 +8,7 @@ except ImportError:
 
 from .constants import Config
 from .downloader.utils import check_cache_dir_available
-from .parser.platform import (
-    BilibiliParser,
-    DouyinParser,
-    KuaishouParser,
-    WeiboParser,
-    XiaohongshuParser,
-    XiaoheiheParser,
-    TwitterParser
-)
+from .parser import platform as platform_parsers
 
 
 class ConfigManager:
@@ -123,7 +115,7 @@ class ConfigManager:
             logger.debug("Debug模式已启用")
 
     def create_parsers(self) -> List:
-        """创建解析器列表
+        """创建解析器列表（仅导入已启用平台的解析器模块）
 
         Returns:
             解析器列表
@@ -132,28 +124,29 @@ class ConfigManager:
             ValueError: 没有启用任何解析器时
         """
         parsers = []
+        proxy_url = self.proxy_addr or None
         
         if self.enable_bilibili:
-            parsers.append(BilibiliParser())
+            parsers.append(platform_parsers.BilibiliParser())
         if self.enable_douyin:
-            parsers.append(DouyinParser())
+            parsers.append(platform_parsers.DouyinParser())
         if self.enable_kuaishou:
-            parsers.append(KuaishouParser())
+            parsers.append(platform_parsers.KuaishouParser())
         if self.enable_weibo:
-            parsers.append(WeiboParser())
+            parsers.append(platform_parsers.WeiboParser())
         if self.enable_xiaohongshu:
-            parsers.append(XiaohongshuParser())
+            parsers.append(platform_parsers.XiaohongshuParser())
         if self.enable_xiaoheihe:
-            parsers.append(XiaoheiheParser(
+            parsers.append(platform_parsers.XiaoheiheParser(
                 use_video_proxy=self.xiaoheihe_use_video_proxy,
-                proxy_url=self.proxy_addr if self.proxy_addr else None
+                proxy_url=proxy_url
             ))
         if self.enable_twitter:
-            parsers.append(TwitterParser(
+            parsers.append(platform_parsers.TwitterParser(
                 use_parse_proxy=self.twitter_use_parse_proxy,
                 use_image_proxy=self.twitter_use_image_proxy,
                 use_video_proxy=self.twitter_use_video_proxy,
-                proxy_url=self.proxy_addr if self.proxy_addr else None
+                proxy_url=proxy_url
             ))
         
         if not parsers:
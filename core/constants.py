@@ -7,12 +7,21 @@ class Config:
     IMAGE_DOWNLOAD_TIMEOUT = 10  # 图片下载超时时间（秒）
     VIDEO_DOWNLOAD_TIMEOUT = 300  # 视频下载超时时间（秒）
     
+    # 大小检查配置
+    VIDEO_SIZE_RANGE_PROBE = True  # 检查视频大小时先使用单字节Range请求，无法得出结果时回退到HEAD
+    VIDEO_SIZE_CACHE_TTL = 600  # 视频大小缓存有效期（秒），避免签名URL过期后仍命中
+    VIDEO_SIZE_CACHE_MAX_ENTRIES = 1024  # 视频大小缓存最大条目数
+    
     # 视频大小阈值配置
     DEFAULT_LARGE_VIDEO_THRESHOLD_MB = 40.0  # 默认大视频阈值（MB），超过此大小的视频将被视为大视频
     MAX_LARGE_VIDEO_THRESHOLD_MB = 100.0  # 最大大视频阈值（MB），用于限制大视频的判断上限
     
     # 流式下载配置
     STREAM_DOWNLOAD_CHUNK_SIZE = 2 * 1024 * 1024  # 流式下载块大小（字节），2MB
+    IMAGE_STREAM_CHUNK_SIZE = 256 * 1024  # 图片流式下载块大小（字节），256KB
+    STREAM_WRITE_QUEUE_SIZE = 4  # 流式下载时等待写入磁盘的最大块数，超过后暂停读取网络数据
+    PARTIAL_DOWNLOAD_SUFFIX = ".part"  # 下载中文件的临时后缀，写入完成后原子重命名为最终文件名
+    DOWNLOADED_MEDIA_INDEX_MAX_ENTRIES = 256  # 记录 媒体URL -> 已下载文件 的最大条目数，用于同一URL跨链接复用
     
     # 范围下载配置
     RANGE_DOWNLOAD_CHUNK_SIZE = 2 * 1024 * 1024  # 范围下载块大小（字节），2MB
@@ -23,7 +32,17 @@ class Config:
     
     # 并发控制配置
     DOWNLOAD_MANAGER_MAX_CONCURRENT = 3  # 下载管理器最大并发任务数
+    DOWNLOAD_MANAGER_MAX_CONCURRENT_PER_HOST = 4  # 下载管理器对同一主机的最大并发下载数
     PARSER_MAX_CONCURRENT = 10  # 解析器最大并发任务数
+    PARSER_MAX_CONCURRENT_PER_HOST = 8  # 单一站点解析请求的最大并发数（避免触发限流）
+    IMAGE_BACKUP_URL_HEDGE_DELAY = 3.0  # 图片当前URL超过该时间（秒）未完成时并行尝试下一个备用URL
+    IMAGE_BACKUP_URL_MAX_PARALLEL = 2  # 图片备用URL最多同时进行的下载数
+    
+    # 连接池配置
+    HTTP_CONNECTOR_LIMIT = 100  # 插件共享连接池的总连接数上限
+    HTTP_DNS_CACHE_TTL = 300  # DNS解析结果缓存时间（秒）
+    HTTP_KEEPALIVE_TIMEOUT = 60  # 空闲keep-alive连接的保留时间（秒）
+    HTTP_READ_BUFSIZE = 256 * 1024  # 响应体读取缓冲区大小（字节），aiohttp默认64KB
     
     # 调试配置
     DEBUG_MODE = False  # 调试模式开关，开启后会输出更详细的调试信息
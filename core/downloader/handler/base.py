@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import Optional, Callable, Dict, Any, Tuple
 
@@ -10,10 +11,50 @@ except ImportError:
     logger = logging.getLogger(__name__)
 
 from ...file_cleaner import cleanup_file
-from ..utils import extract_size_from_headers
+from ..utils import extract_size_from_headers, is_encoded_response, sniff_image_content_type
 from ..validator import validate_media_response
 from ...constants import Config
 
+_VIDEO_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=Config.VIDEO_DOWNLOAD_TIMEOUT)
+_IMAGE_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=Config.IMAGE_DOWNLOAD_TIMEOUT)
+# 图片/视频本身已是压缩格式，默认不接受传输压缩，省去解压开销（调用方显式指定时以调用方为准）
+_IDENTITY_ENCODING_HEADERS = {'Accept-Encoding': 'identity'}
+
+
+def _preallocate(f, size: int) -> None:
+    """按预期大小预先分配文件空间，减少大文件边写边扩展造成的碎片（阻塞操作，在线程中执行）
+
+    不支持 posix_fallocate 的平台或文件系统上静默跳过。
+
+    Args:
+        f: 已打开的文件对象
+        size: 预期文件大小（字节）
+    """
+    if not hasattr(os, 'posix_fallocate'):
+        return
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except OSError:
+        pass
+
+
+def _cleanup_failed_download(part_path: str, file_path: str) -> None:
+    """清理下载失败或被取消时留下的文件
+
+    除临时文件外，路径生成函数可能已预先创建了空的目标文件（如图片的
+    NamedTemporaryFile），同样需要删除；非空的目标文件不动。
+
+    Args:
+        part_path: 临时文件路径
+        file_path: 目标文件路径
+    """
+    cleanup_file(part_path)
+    try:
+        if os.path.getsize(file_path) == 0:
+            cleanup_file(file_path)
+    except OSError:
+        pass
+
 
 async def download_media_stream(
     response: aiohttp.ClientResponse,
@@ -23,36 +64,76 @@ async def download_media_stream(
 ) -> bool:
     """下载媒体流到文件
 
+    数据先写入同目录下的临时文件，完整写完后再原子替换为目标文件，
+    中途失败或进程退出都不会留下被截断的目标文件。
+
     Args:
         response: HTTP响应对象
-        file_path: 文件路径
+        file_path: 文件路径（所在目录需已存在，由路径生成函数负责创建）
         content_preview: 已读取的内容预览（如果Content-Type为空）
-        is_video: 是否为视频（True为视频使用流式下载，False为图片使用完整下载）
+        is_video: 是否为视频（决定流式下载的块大小）
 
     Returns:
         下载是否成功
     """
+    part_path = f"{file_path}{Config.PARTIAL_DOWNLOAD_SUFFIX}"
     try:
-        file_dir = os.path.dirname(file_path)
-        if file_dir:
-            os.makedirs(file_dir, exist_ok=True)
+        chunk_size = (
+            Config.STREAM_DOWNLOAD_CHUNK_SIZE
+            if is_video
+            else Config.IMAGE_STREAM_CHUNK_SIZE
+        )
+        f = await asyncio.to_thread(open, part_path, 'wb')
+        expected_size = response.content_length
+        if is_video and expected_size and not is_encoded_response(response):
+            await asyncio.to_thread(_preallocate, f, expected_size)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=Config.STREAM_WRITE_QUEUE_SIZE)
+        write_errors = []
+        
+        async def write_chunks():
+            """从队列取出数据块写入文件，与网络读取并行"""
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    return
+                if write_errors:
+                    continue
+                try:
+                    await asyncio.to_thread(f.write, chunk)
+                except Exception as e:
+                    write_errors.append(e)
         
-        with open(file_path, 'wb') as f:
+        writer = asyncio.create_task(write_chunks())
+        try:
             if content_preview:
-                f.write(content_preview)
-            
-            if is_video:
-                async for chunk in response.content.iter_chunked(Config.STREAM_DOWNLOAD_CHUNK_SIZE):
-                    f.write(chunk)
-            else:
-                content = await response.read()
-                f.write(content)
-            
-            f.flush()
+                await queue.put(content_preview)
+            async for chunk in response.content.iter_chunked(chunk_size):
+                if write_errors:
+                    break
+                await queue.put(chunk)
+            await queue.put(None)
+            await writer
+            if not write_errors:
+                # 实际长度与预分配长度不一致时截掉多余部分
+                await asyncio.to_thread(f.truncate)
+        finally:
+            if not writer.done():
+                writer.cancel()
+                try:
+                    await writer
+                except asyncio.CancelledError:
+                    pass
+            await asyncio.to_thread(f.close)
+        if write_errors:
+            raise write_errors[0]
+        await asyncio.to_thread(os.replace, part_path, file_path)
         return True
+    except asyncio.CancelledError:
+        _cleanup_failed_download(part_path, file_path)
+        raise
     except Exception as e:
         logger.warning(f"下载媒体流失败: {file_path}, 错误: {e}")
-        cleanup_file(file_path)
+        _cleanup_failed_download(part_path, file_path)
         return False
 
 
@@ -69,7 +150,7 @@ async def download_media_from_url(
     Args:
         session: aiohttp会话
         media_url: 媒体URL
-        file_path_generator: 文件路径生成函数，接受 (content_type, media_url) 参数，返回文件路径
+        file_path_generator: 文件路径生成函数，接受 (content_type, media_url) 参数，返回已标准化的文件路径
         is_video: 是否为视频（True为视频，False为图片）
         headers: 请求头字典
         proxy: 代理地址（可选）
@@ -78,11 +159,9 @@ async def download_media_from_url(
         (file_path, size_mb) 元组，失败返回 (None, None)
     """
     try:
-        request_headers = headers or {}
+        request_headers = {**_IDENTITY_ENCODING_HEADERS, **(headers or {})}
         
-        timeout = aiohttp.ClientTimeout(
-            total=Config.VIDEO_DOWNLOAD_TIMEOUT if is_video else Config.IMAGE_DOWNLOAD_TIMEOUT
-        )
+        timeout = _VIDEO_DOWNLOAD_TIMEOUT if is_video else _IMAGE_DOWNLOAD_TIMEOUT
         
         async with session.get(
             media_url,
@@ -99,6 +178,8 @@ async def download_media_from_url(
                 return None, None
             
             content_type = response.headers.get('Content-Type', '')
+            if not content_type and not is_video:
+                content_type = sniff_image_content_type(content_preview) or ''
             size_mb = extract_size_from_headers(response)
             
             file_path = file_path_generator(content_type, media_url)
@@ -106,11 +187,11 @@ async def download_media_from_url(
             if await download_media_stream(response, file_path, content_preview, is_video=is_video):
                 if size_mb is None:
                     try:
-                        file_size_bytes = os.path.getsize(file_path)
+                        file_size_bytes = await asyncio.to_thread(os.path.getsize, file_path)
                         size_mb = file_size_bytes / (1024 * 1024)
                     except Exception:
                         pass
-                return os.path.normpath(file_path), size_mb
+                return file_path, size_mb
             return None, None
     except Exception as e:
         logger.warning(f"下载媒体失败: {media_url}, 错误: {e}")
@@ -12,23 +12,26 @@ except ImportError:
     logger = logging.getLogger(__name__)
 
 from ..utils import generate_cache_file_path, get_image_suffix
+from ...file_cleaner import cleanup_file
 from .base import download_media_from_url
 
 
 def _is_supported_image_format(file_path: str) -> bool:
     """检查图片格式是否为支持的格式（jpg, jpeg, png）
     
+    仅根据扩展名判断，不访问文件系统（调用方传入的是刚下载完成的文件）。
+    
     Args:
         file_path: 图片文件路径
         
     Returns:
         是否为支持的格式
     """
-    if not file_path or not os.path.exists(file_path):
+    if not file_path:
         return False
     
     ext = os.path.splitext(file_path)[1].lower()
-    return ext in ['.jpg', '.jpeg', '.png']
+    return ext in ('.jpg', '.jpeg', '.png')
 
 
 async def _convert_image_to_png(input_path: str, output_path: str) -> bool:
@@ -147,12 +150,15 @@ async def download_image_to_cache(
         base_path = os.path.splitext(file_path)[0]
         png_path = f"{base_path}.png"
         
-        if await _convert_image_to_png(file_path, png_path):
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except Exception as e:
-                logger.warning(f"删除原图片文件失败: {e}")
+        try:
+            converted = await _convert_image_to_png(file_path, png_path)
+        except asyncio.CancelledError:
+            # 被取消（如备用URL竞速中落败）时不留下已下载的文件
+            cleanup_file(file_path)
+            cleanup_file(png_path)
+            raise
+        if converted:
+            cleanup_file(file_path)
             return png_path
         else:
             logger.warning(f"图片格式转换失败，保留原文件: {file_path}")
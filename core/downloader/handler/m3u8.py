@@ -19,6 +19,57 @@ except ImportError:
 from ...file_cleaner import cleanup_directory
 from ...constants import Config
 
+_URI_ATTR_PATTERN = re.compile(r'URI="([^"]+)"')
+
+
+def _append_file(src, dst) -> None:
+    """将源文件内容追加到目标文件末尾
+
+    支持 os.sendfile 的平台在内核态完成拷贝，不经过 Python 缓冲区；
+    其他平台、sendfile 不可用或中途未能发送完时，从已发送的位置起退回
+    shutil.copyfileobj，并在返回前 flush，保证下一次调用时的前置条件。
+
+    Args:
+        src: 以二进制读模式打开的源文件对象
+        dst: 以二进制写模式打开的目标文件对象（调用前需已 flush）
+    """
+    if hasattr(os, 'sendfile'):
+        in_fd = src.fileno()
+        out_fd = dst.fileno()
+        remaining = os.fstat(in_fd).st_size
+        offset = 0
+        try:
+            while remaining > 0:
+                sent = os.sendfile(out_fd, in_fd, offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except OSError:
+            pass
+        if remaining <= 0:
+            return
+        src.seek(offset)
+    shutil.copyfileobj(src, dst)
+    dst.flush()
+
+
+def _merge_files(init_data: Optional[bytes], files: List[str], output: str) -> None:
+    """将 init segment 与分片文件依次写入输出文件（阻塞操作，在线程中执行）
+
+    Args:
+        init_data: init segment 内容（可选）
+        files: 分片文件路径列表
+        output: 输出文件路径
+    """
+    with open(output, 'wb') as out:
+        if init_data:
+            out.write(init_data)
+        out.flush()
+        for f in files:
+            with open(f, 'rb') as inp:
+                _append_file(inp, out)
+
 
 class M3U8Handler:
 
@@ -81,13 +132,12 @@ class M3U8Handler:
 
         Args:
             url: 文件URL
-            output_path: 输出路径
+            output_path: 输出路径（所在目录需已存在）
 
         Returns:
             下载是否成功
         """
         try:
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
             async with self.session.get(
                 url,
                 headers=self.headers,
@@ -119,7 +169,7 @@ class M3U8Handler:
         for line in content.split('\n'):
             line = line.strip()
             if 'URI=' in line:
-                match = re.search(r'URI="([^"]+)"', line)
+                match = _URI_ATTR_PATTERN.search(line)
                 if match:
                     init_seg = match.group(1)
             elif line and not line.startswith('#'):
@@ -184,13 +234,8 @@ class M3U8Handler:
             合并是否成功
         """
         try:
-            with open(output, 'wb') as out:
-                if init_seg:
-                    init_data = await self.fetch_bytes(init_seg)
-                    out.write(init_data)
-                for f in files:
-                    with open(f, 'rb') as inp:
-                        shutil.copyfileobj(inp, out)
+            init_data = await self.fetch_bytes(init_seg) if init_seg else None
+            await asyncio.to_thread(_merge_files, init_data, files, output)
             return True
         except Exception as e:
             logger.warning(f"合并分片失败: {e}")
@@ -215,7 +260,7 @@ class M3U8Handler:
         for line in master.split('\n'):
             line = line.strip()
             if 'TYPE=AUDIO' in line and 'URI=' in line:
-                match = re.search(r'URI="([^"]+)"', line)
+                match = _URI_ATTR_PATTERN.search(line)
                 if match:
                     audio_m3u8 = match.group(1)
             elif not line.startswith('#') and '.m3u8' in line:
@@ -260,7 +305,7 @@ class M3U8Handler:
                 )
                 video_merged = os.path.join(temp_dir, "video.m4s")
                 if await self.merge_segments(v_init, v_files, video_merged):
-                    shutil.move(video_merged, output_path)
+                    await asyncio.to_thread(shutil.move, video_merged, output_path)
                     logger.info(f"✓ 视频下载完成: {output_path}")
                     return True
                 return False
@@ -273,7 +318,7 @@ class M3U8Handler:
                 )
                 video_merged = os.path.join(temp_dir, "video.m4s")
                 if await self.merge_segments(v_init, v_files, video_merged):
-                    shutil.move(video_merged, output_path)
+                    await asyncio.to_thread(shutil.move, video_merged, output_path)
                     logger.info(f"✓ 视频下载完成: {output_path}")
                     return True
                 return False
@@ -305,7 +350,7 @@ class M3U8Handler:
 
             if use_ffmpeg:
                 try:
-                    subprocess.run([
+                    await asyncio.to_thread(subprocess.run, [
                         "ffmpeg", "-y", "-i", video_merged, "-i", audio_merged,
                         "-c", "copy", "-map", "0:v:0", "-map", "1:a:0",
                         output_path
@@ -314,16 +359,16 @@ class M3U8Handler:
                     return True
                 except subprocess.CalledProcessError as e:
                     logger.warning(f"ffmpeg 合并失败: {e}")
-                    shutil.move(video_merged, output_path)
+                    await asyncio.to_thread(shutil.move, video_merged, output_path)
                     logger.info(f"✓ 视频下载完成（无音频）: {output_path}")
                     return True
                 except FileNotFoundError:
                     logger.warning("ffmpeg 未找到，尝试只保存视频")
-                    shutil.move(video_merged, output_path)
+                    await asyncio.to_thread(shutil.move, video_merged, output_path)
                     logger.info(f"✓ 视频下载完成（无音频）: {output_path}")
                     return True
             else:
-                shutil.move(video_merged, output_path)
+                await asyncio.to_thread(shutil.move, video_merged, output_path)
                 logger.info(f"✓ 视频下载完成（无音频）: {output_path}")
                 return True
 
@@ -331,7 +376,7 @@ class M3U8Handler:
             logger.error(f"✗ 视频下载失败: {e}")
             return False
         finally:
-            cleanup_directory(temp_dir, ignore_errors=True)
+            await asyncio.to_thread(cleanup_directory, temp_dir, ignore_errors=True)
 
     async def download_m3u8_to_cache(
         self,
@@ -366,11 +411,12 @@ class M3U8Handler:
                 m3u8_url, output_path, use_ffmpeg
             )
 
-            if success and os.path.exists(output_path):
+            if success:
                 try:
-                    file_size_bytes = os.path.getsize(output_path)
-                    size_mb = file_size_bytes / (1024 * 1024)
-                except Exception:
+                    size_mb = (await asyncio.to_thread(os.stat, output_path)).st_size / (1024 * 1024)
+                except FileNotFoundError:
+                    return None
+                except OSError:
                     size_mb = None
 
                 return {
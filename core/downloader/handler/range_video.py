@@ -1,5 +1,6 @@
 import asyncio
 import os
+from collections import ChainMap
 from typing import Dict, Any, Optional, Tuple
 
 import aiohttp
@@ -10,9 +11,18 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
-from ..utils import generate_cache_file_path
+from ..utils import generate_cache_file_path, is_encoded_response
+from ..validator import get_cached_video_size
+from ...file_cleaner import cleanup_file
+from .normal_video import download_video_to_cache as normal_download
 from ...constants import Config
 
+_BYTES_PER_MB = 1024 * 1024
+_SIZE_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=Config.VIDEO_SIZE_CHECK_TIMEOUT)
+_RANGE_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=Config.VIDEO_DOWNLOAD_TIMEOUT)
+# 分片请求默认不接受压缩编码，保证返回的字节与 Range 区间一一对应（调用方显式指定时以调用方为准）
+_IDENTITY_ENCODING_HEADERS = {'Accept-Encoding': 'identity'}
+
 
 async def _get_file_size(
     session: aiohttp.ClientSession,
@@ -31,17 +41,22 @@ async def _get_file_size(
     Returns:
         文件大小（字节），失败时为None
     """
+    cached_size_mb = get_cached_video_size(url)
+    if cached_size_mb is not None:
+        return int(cached_size_mb * _BYTES_PER_MB)
+    
     try:
-        request_headers = headers or {}
-        timeout = aiohttp.ClientTimeout(total=Config.VIDEO_SIZE_CHECK_TIMEOUT)
+        request_headers = {**(headers or {}), 'Accept-Encoding': 'identity'}
+        timeout = _SIZE_CHECK_TIMEOUT
         
         async with session.head(
             url,
             headers=request_headers,
             timeout=timeout,
-            proxy=proxy
+            proxy=proxy,
+            allow_redirects=True
         ) as response:
-            if response.status == 200:
+            if response.status == 200 and not is_encoded_response(response):
                 content_length = response.headers.get('Content-Length')
                 if content_length:
                     return int(content_length)
@@ -53,14 +68,17 @@ async def _get_file_size(
                 timeout=timeout,
                 proxy=proxy
             ) as get_response:
-                if get_response.status in (200, 206):
+                if get_response.status == 206:
+                    # 读完单字节响应体，连接才能放回连接池供随后的分块下载复用
+                    await get_response.read()
                     content_range = get_response.headers.get('Content-Range')
                     if content_range:
-                        match = content_range.split('/')
-                        if len(match) > 1:
-                            return int(match[1])
+                        total = content_range.rpartition('/')[2].strip()
+                        if total.isdigit():
+                            return int(total)
+                elif get_response.status == 200:
                     content_length = get_response.headers.get('Content-Length')
-                    if content_length:
+                    if content_length and not is_encoded_response(get_response):
                         return int(content_length)
     except Exception as e:
         logger.debug(f"获取文件大小失败: {url}, 错误: {e}")
@@ -68,6 +86,31 @@ async def _get_file_size(
     return None
 
 
+def _write_chunks(
+    part_path: str,
+    file_path: str,
+    chunks_data: Dict[int, bytes],
+    num_chunks: int
+) -> int:
+    """按顺序写入所有分块并原子替换为目标文件（阻塞操作，在线程中执行）
+
+    Args:
+        part_path: 临时文件路径
+        file_path: 目标文件路径
+        chunks_data: 分块索引 -> 分块数据
+        num_chunks: 分块数量
+
+    Returns:
+        写入的总字节数
+    """
+    with open(part_path, 'wb') as f:
+        for i in range(num_chunks):
+            f.write(chunks_data[i])
+        actual_size = f.tell()
+    os.replace(part_path, file_path)
+    return actual_size
+
+
 async def _download_range(
     session: aiohttp.ClientSession,
     url: str,
@@ -84,7 +127,7 @@ async def _download_range(
         url: 文件URL
         start: 起始字节位置
         end: 结束字节位置（包含）
-        headers: 请求头字典
+        headers: 各分块共用的请求头字典（只读，不会被修改）
         proxy: 代理地址（可选）
         chunk_index: chunk索引（用于日志）
 
@@ -92,10 +135,12 @@ async def _download_range(
         下载的字节数据，失败时为None
     """
     try:
-        request_headers = (headers or {}).copy()
-        request_headers['Range'] = f'bytes={start}-{end}'
+        request_headers = ChainMap(
+            {'Range': f'bytes={start}-{end}'},
+            headers or _IDENTITY_ENCODING_HEADERS
+        )
         
-        timeout = aiohttp.ClientTimeout(total=Config.VIDEO_DOWNLOAD_TIMEOUT)
+        timeout = _RANGE_DOWNLOAD_TIMEOUT
         
         async with session.get(
             url,
@@ -150,7 +195,6 @@ async def download_video_to_cache(
         file_size = await _get_file_size(session, video_url, headers, proxy)
         if file_size is None:
             logger.warning(f"无法获取文件大小，降级为normal_video: {video_url}")
-            from .normal_video import download_video_to_cache as normal_download
             return await normal_download(
                 session, video_url, cache_dir, media_id, index, headers, proxy
             )
@@ -159,7 +203,6 @@ async def download_video_to_cache(
         
         if num_chunks <= 1:
             logger.debug(f"文件太小，使用normal_video: {video_url}, size={file_size}")
-            from .normal_video import download_video_to_cache as normal_download
             return await normal_download(
                 session, video_url, cache_dir, media_id, index, headers, proxy
             )
@@ -180,6 +223,7 @@ async def download_video_to_cache(
         
         temp_chunks = []
         semaphore = asyncio.Semaphore(max_concurrent)
+        chunk_headers = {**_IDENTITY_ENCODING_HEADERS, **(headers or {})}
         
         async def download_chunk(chunk_idx: int) -> Tuple[int, Optional[bytes]]:
             """下载单个chunk"""
@@ -187,7 +231,7 @@ async def download_video_to_cache(
                 start = chunk_idx * chunk_size
                 end = min(start + chunk_size - 1, file_size - 1)
                 data = await _download_range(
-                    session, video_url, start, end, headers, proxy, chunk_idx
+                    session, video_url, start, end, chunk_headers, proxy, chunk_idx
                 )
                 return chunk_idx, data
         
@@ -215,26 +259,26 @@ async def download_video_to_cache(
                 f"部分chunks下载失败 ({len(failed_chunks)}/{num_chunks})，"
                 f"降级为normal_video: {video_url}"
             )
-            from .normal_video import download_video_to_cache as normal_download
             return await normal_download(
                 session, video_url, cache_dir, media_id, index, headers, proxy
             )
         
+        missing_chunk = next(
+            (i for i in range(num_chunks) if i not in chunks_data),
+            None
+        )
+        if missing_chunk is not None:
+            logger.error(f"缺少chunk {missing_chunk}，降级为normal_video")
+            return await normal_download(
+                session, video_url, cache_dir, media_id, index, headers, proxy
+            )
+        
+        part_path = f"{file_path}{Config.PARTIAL_DOWNLOAD_SUFFIX}"
         try:
-            with open(file_path, 'wb') as f:
-                for i in range(num_chunks):
-                    if i in chunks_data:
-                        f.write(chunks_data[i])
-                    else:
-                        logger.error(f"缺少chunk {i}，降级为normal_video")
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                        from .normal_video import download_video_to_cache as normal_download
-                        return await normal_download(
-                            session, video_url, cache_dir, media_id, index, headers, proxy
-                        )
+            actual_size = await asyncio.to_thread(
+                _write_chunks, part_path, file_path, chunks_data, num_chunks
+            )
             
-            actual_size = os.path.getsize(file_path)
             size_mb = actual_size / (1024 * 1024)
             
             logger.debug(
@@ -243,24 +287,18 @@ async def download_video_to_cache(
             )
             
             return {
-                'file_path': os.path.normpath(file_path),
+                'file_path': file_path,
                 'size_mb': size_mb
             }
         except Exception as e:
             logger.warning(f"合并chunks失败: {video_url}, 错误: {e}")
-            if os.path.exists(file_path):
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    pass
-            from .normal_video import download_video_to_cache as normal_download
+            cleanup_file(part_path)
             return await normal_download(
                 session, video_url, cache_dir, media_id, index, headers, proxy
             )
     
     except Exception as e:
         logger.warning(f"Range下载失败，降级为normal_video: {video_url}, 错误: {e}")
-        from .normal_video import download_video_to_cache as normal_download
         return await normal_download(
             session, video_url, cache_dir, media_id, index, headers, proxy
         )
@@ -1,8 +1,12 @@
 import asyncio
 import hashlib
+import os
 import re
 import time
-from typing import Dict, Any, List, Optional, Tuple
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import aiohttp
@@ -13,10 +17,15 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
-from .utils import check_cache_dir_available, process_gather_results
-from .validator import get_video_size, validate_media_url
+from .utils import (
+    check_cache_dir_available,
+    find_cached_media_file,
+    link_cached_media_file,
+    process_gather_results
+)
+from .validator import cancel_video_size_checks, get_video_size, validate_media_url
 from .router import download_media
-from ..file_cleaner import cleanup_files
+from ..file_cleaner import cleanup_file, cleanup_files_async
 from ..constants import Config
 
 
@@ -28,7 +37,8 @@ class DownloadManager:
         large_video_threshold_mb: float = Config.DEFAULT_LARGE_VIDEO_THRESHOLD_MB,
         cache_dir: str = "/app/sharedFolder/video_parser/cache",
         pre_download_all_media: bool = False,
-        max_concurrent_downloads: int = None
+        max_concurrent_downloads: int = None,
+        max_concurrent_per_host: int = Config.DOWNLOAD_MANAGER_MAX_CONCURRENT_PER_HOST
     ):
         """初始化下载管理器
 
@@ -39,6 +49,7 @@ class DownloadManager:
             cache_dir: 视频缓存目录
             pre_download_all_media: 是否预先下载所有媒体到本地
             max_concurrent_downloads: 最大并发下载数
+            max_concurrent_per_host: 同一主机的最大并发下载数
         """
         self.max_video_size_mb = max_video_size_mb
         if large_video_threshold_mb > 0:
@@ -48,7 +59,7 @@ class DownloadManager:
             )
         else:
             self.large_video_threshold_mb = 0.0
-        self.cache_dir = cache_dir
+        self.cache_dir = os.path.normpath(cache_dir) if cache_dir else cache_dir
         self.max_concurrent_downloads = (
             max_concurrent_downloads 
             if max_concurrent_downloads is not None 
@@ -56,9 +67,133 @@ class DownloadManager:
         )
         self.effective_pre_download = pre_download_all_media and check_cache_dir_available(cache_dir)
         
-        self._active_sessions: List[aiohttp.ClientSession] = []
-        self._active_tasks: List[asyncio.Task] = []
+        # 各消息的会话用完即关闭，弱引用集合不会让已结束的会话一直驻留
+        self._active_sessions: "weakref.WeakSet[aiohttp.ClientSession]" = weakref.WeakSet()
+        self._active_tasks: Set[asyncio.Task] = set()
         self._shutting_down = False
+        self._download_semaphore: Optional[asyncio.Semaphore] = None
+        self.max_concurrent_per_host = max_concurrent_per_host
+        # 主机 -> [信号量, 使用者数量]，无使用者时移除，避免CDN子域名过多导致字典无限增长
+        self._host_semaphores: Dict[str, List[Any]] = {}
+        # (首个媒体URL, 是否视频) -> 已下载文件路径，按最近使用顺序排列
+        self._downloaded_media: "OrderedDict[Tuple[str, bool], str]" = OrderedDict()
+        # (首个媒体URL, 是否视频) -> 正在下载时的完成信号，多条消息并发下载同一媒体时只请求一次
+        self._downloading_media: Dict[Tuple[str, bool], asyncio.Future] = {}
+
+    def _get_download_semaphore(self, max_concurrent: int) -> asyncio.Semaphore:
+        """获取批量下载使用的信号量
+
+        默认并发数共用同一个实例级信号量，使多条消息同时触发下载时总并发仍受
+        max_concurrent_downloads 限制；显式指定其他并发数时使用独立信号量。
+
+        Args:
+            max_concurrent: 最大并发下载数
+
+        Returns:
+            信号量对象
+        """
+        if max_concurrent != self.max_concurrent_downloads:
+            return asyncio.Semaphore(max_concurrent)
+        if self._download_semaphore is None:
+            self._download_semaphore = asyncio.Semaphore(max_concurrent)
+        return self._download_semaphore
+
+    async def _gather_tracked(self, coros: Iterable[Awaitable[Any]]) -> List[Any]:
+        """并发执行协程并登记为活动任务，结果顺序与输入一致
+
+        登记的任务会在 shutdown 时被统一取消；单个任务失败不影响其他任务，
+        异常作为结果返回，由调用方按项处理。
+
+        Args:
+            coros: 协程可迭代对象
+
+        Returns:
+            结果列表（失败项为异常对象）
+        """
+        tasks = [asyncio.create_task(coro) for coro in coros]
+        self._active_tasks.update(tasks)
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._active_tasks.difference_update(tasks)
+
+    async def _reuse_downloaded_media(
+        self,
+        key: Tuple[str, bool],
+        cache_dir: str,
+        media_id: str,
+        media_type: str,
+        index: int
+    ) -> Optional[Tuple[str, int]]:
+        """复用其他链接已下载的同一媒体URL的文件
+
+        Args:
+            key: (首个媒体URL, 是否视频)
+            cache_dir: 缓存目录
+            media_id: 目标媒体ID
+            media_type: 媒体类型，'video' 或 'image'
+            index: 媒体索引
+
+        Returns:
+            (file_path, size_bytes) 元组，无可复用文件时为None
+        """
+        src_path = self._downloaded_media.get(key)
+        if src_path is None:
+            return None
+        file_path = await asyncio.to_thread(
+            link_cached_media_file, src_path, cache_dir, media_id, media_type, index
+        )
+        if file_path is None:
+            if self._downloaded_media.get(key) == src_path:
+                del self._downloaded_media[key]
+            return None
+        if key in self._downloaded_media:
+            self._downloaded_media.move_to_end(key)
+        try:
+            return file_path, await asyncio.to_thread(os.path.getsize, file_path)
+        except OSError:
+            return None
+
+    def _remember_downloaded_media(self, key: Tuple[str, bool], file_path: str) -> None:
+        """记录媒体URL对应的已下载文件，超过容量时淘汰最久未使用的条目
+
+        Args:
+            key: (首个媒体URL, 是否视频)
+            file_path: 已下载文件路径
+        """
+        self._downloaded_media[key] = file_path
+        self._downloaded_media.move_to_end(key)
+        while len(self._downloaded_media) > Config.DOWNLOADED_MEDIA_INDEX_MAX_ENTRIES:
+            self._downloaded_media.popitem(last=False)
+
+    @asynccontextmanager
+    async def _host_slot(self, url: str):
+        """占用指定URL所属主机的一个下载名额
+
+        与全局下载信号量配合使用，且始终先占用主机名额再占用全局名额：
+        等待繁忙主机的任务不会占着全局名额，不同主机之间的下载互不影响，
+        两层信号量的获取顺序一致也避免了相互等待造成的死锁。
+
+        Args:
+            url: 媒体URL（可带 range:/m3u8: 前缀）
+        """
+        if url.startswith(('range:', 'm3u8:')):
+            url = url.partition(':')[2]
+        host = urlparse(url).netloc
+        entry = self._host_semaphores.get(host)
+        if entry is None:
+            entry = self._host_semaphores[host] = [
+                asyncio.Semaphore(self.max_concurrent_per_host),
+                0
+            ]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._host_semaphores[host]
 
     async def _download_one_image(
         self,
@@ -88,21 +223,104 @@ class DownloadManager:
         proxy_url = metadata.get('proxy_url') or proxy_addr
         proxy = proxy_url if (use_image_proxy and proxy_url) else None
         
-        for url in url_list:
-            result = await download_media(
-                session,
-                url,
-                media_type=None,
-                cache_dir=None,
-                media_id='image',
-                index=img_idx,
-                headers=headers,
-                proxy=proxy
-            )
-            if result and result.get('file_path'):
-                return result.get('file_path')
+        semaphore = self._get_download_semaphore(self.max_concurrent_downloads)
         
-        return None
+        async def download_from(url: str, started: asyncio.Event) -> Optional[str]:
+            async with self._host_slot(url), semaphore:
+                started.set()
+                result = await download_media(
+                    session,
+                    url,
+                    media_type=None,
+                    cache_dir=None,
+                    media_id='image',
+                    index=img_idx,
+                    headers=headers,
+                    proxy=proxy
+                )
+            return result.get('file_path') if result else None
+        
+        return await self._download_first_available(url_list, download_from)
+
+    @staticmethod
+    async def _download_first_available(
+        url_list: List[str],
+        download_from: Callable[[str, asyncio.Event], Awaitable[Optional[str]]]
+    ) -> Optional[str]:
+        """按顺序尝试URL列表，返回第一个下载成功的文件路径
+
+        当前URL失败时立即尝试下一个；当前URL拿到下载名额后超过
+        IMAGE_BACKUP_URL_HEDGE_DELAY 仍未完成时，并行启动下一个备用URL
+        （同时最多 IMAGE_BACKUP_URL_MAX_PARALLEL 个），取最先成功的结果并取消
+        其余下载，多下载出的文件会被清理。排队等待名额的时间不计入，
+        避免图片较多时排队本身触发大量备用下载。
+
+        Args:
+            url_list: URL列表
+            download_from: 下载单个URL的协程函数，参数为 (URL, 开始事件)，
+                拿到下载名额、真正开始下载时需设置开始事件；
+                成功返回文件路径，失败返回None
+
+        Returns:
+            文件路径，全部失败时为None
+        """
+        next_idx = 0
+        pending = set()
+        latest_started = asyncio.Event()
+        
+        def start_next() -> None:
+            nonlocal next_idx, latest_started
+            latest_started = asyncio.Event()
+            pending.add(asyncio.create_task(
+                download_from(url_list[next_idx], latest_started)
+            ))
+            next_idx += 1
+        
+        winner = None
+        try:
+            start_next()
+            while pending:
+                can_hedge = (
+                    next_idx < len(url_list)
+                    and len(pending) < Config.IMAGE_BACKUP_URL_MAX_PARALLEL
+                )
+                if can_hedge and not latest_started.is_set():
+                    # 先等最近启动的下载拿到名额（或有下载结束），再开始备用URL的计时
+                    started_waiter = asyncio.ensure_future(latest_started.wait())
+                    try:
+                        await asyncio.wait(
+                            pending | {started_waiter},
+                            return_when=asyncio.FIRST_COMPLETED
+                        )
+                    finally:
+                        started_waiter.cancel()
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=Config.IMAGE_BACKUP_URL_HEDGE_DELAY if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.cancelled() or task.exception() is not None:
+                        continue
+                    file_path = task.result()
+                    if not file_path:
+                        continue
+                    if winner is None:
+                        winner = file_path
+                    else:
+                        cleanup_file(file_path)
+                if winner is not None:
+                    return winner
+                if next_idx < len(url_list) and len(pending) < Config.IMAGE_BACKUP_URL_MAX_PARALLEL:
+                    start_next()
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                for result in await asyncio.gather(*pending, return_exceptions=True):
+                    if isinstance(result, str) and result:
+                        cleanup_file(result)
 
     async def _download_images(
         self,
@@ -137,15 +355,7 @@ class DownloadManager:
                 )
                 for idx, url_list in enumerate(image_urls)
             ]
-            tasks = [asyncio.create_task(coro) for coro in coros]
-            self._active_tasks.extend(tasks)
-            
-            try:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-            finally:
-                for task in tasks:
-                    if task in self._active_tasks:
-                        self._active_tasks.remove(task)
+            results = await self._gather_tracked(coros)
 
             for result in results:
                 if isinstance(result, Exception):
@@ -227,15 +437,7 @@ class DownloadManager:
             self._get_video_size_task(session, url_list, metadata, proxy_addr)
             for url_list in video_urls
         ]
-        tasks = [asyncio.create_task(coro) for coro in coros]
-        self._active_tasks.extend(tasks)
-        
-        try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        finally:
-            for task in tasks:
-                if task in self._active_tasks:
-                    self._active_tasks.remove(task)
+        results = await self._gather_tracked(coros)
         
         for result in results:
             if isinstance(result, Exception):
@@ -425,7 +627,8 @@ class DownloadManager:
     ) -> List[Dict[str, Any]]:
         """批量下载媒体到缓存目录（支持视频和图片混合）
         
-        此方法会根据媒体类型使用相应的下载器（通过 router.download_media）
+        此方法会根据媒体类型使用相应的下载器（通过 router.download_media）。
+        URL列表与媒体类型都相同的媒体项只下载一次，结果按原顺序回填到每个媒体项。
 
         Args:
             session: aiohttp会话
@@ -442,37 +645,57 @@ class DownloadManager:
 
         if max_concurrent is None:
             max_concurrent = self.max_concurrent_downloads
-        semaphore = asyncio.Semaphore(max_concurrent)
+        semaphore = self._get_download_semaphore(max_concurrent)
 
         async def download_one(item: Dict[str, Any]) -> Dict[str, Any]:
-            async with semaphore:
-                try:
-                    url_list = item.get('url_list', [])
-                    media_id = item.get('media_id', 'media')
-                    index = item.get('index', 0)
-                    item_headers = item.get('headers', {})
-                    item_proxy = item.get('proxy')
-
-                    if not url_list or not isinstance(url_list, list):
-                        return {
-                            'url': url_list[0] if url_list else None,
-                            'file_path': None,
-                            'success': False,
-                            'index': index
-                        }
+            try:
+                url_list = item['url_list']
+                media_id = item.get('media_id', 'media')
+                index = item.get('index', 0)
+                item_headers = item.get('headers', {})
+                item_proxy = item.get('proxy')
+
+                media_type = 'video' if item.get('is_video') else 'image'
+                media_key = (url_list[0], bool(item.get('is_video')))
+                cached = await asyncio.to_thread(
+                    find_cached_media_file, cache_dir, media_id, media_type, index
+                )
+                if cached is None:
+                    downloading = self._downloading_media.get(media_key)
+                    if downloading is not None:
+                        # 其他消息正在下载同一媒体，等其完成后直接复用文件
+                        await asyncio.wait({downloading})
+                    cached = await self._reuse_downloaded_media(
+                        media_key, cache_dir, media_id, media_type, index
+                    )
+                if cached is not None:
+                    cached_path, cached_size = cached
+                    logger.debug(f"命中已下载的缓存文件，跳过下载: {cached_path}")
+                    return {
+                        'url': url_list[0],
+                        'file_path': cached_path,
+                        'size_mb': cached_size / (1024 * 1024),
+                        'success': True,
+                        'index': index
+                    }
 
+                done = asyncio.get_running_loop().create_future()
+                self._downloading_media.setdefault(media_key, done)
+                try:
                     for url in url_list:
-                        result = await download_media(
-                            session,
-                            url,
-                            media_type=None,
-                            cache_dir=cache_dir,
-                            media_id=media_id,
-                            index=index,
-                            headers=item_headers,
-                            proxy=item_proxy
-                        )
+                        async with self._host_slot(url), semaphore:
+                            result = await download_media(
+                                session,
+                                url,
+                                media_type=None,
+                                cache_dir=cache_dir,
+                                media_id=media_id,
+                                index=index,
+                                headers=item_headers,
+                                proxy=item_proxy
+                            )
                         if result and result.get('file_path'):
+                            self._remember_downloaded_media(media_key, result['file_path'])
                             return {
                                 'url': url_list[0],
                                 'file_path': result.get('file_path'),
@@ -480,29 +703,84 @@ class DownloadManager:
                                 'success': True,
                                 'index': index
                             }
-                    
-                    return {
-                        'url': url_list[0] if url_list else None,
-                        'file_path': None,
-                        'size_mb': None,
-                        'success': False,
-                        'index': index
-                    }
-                except Exception as e:
-                    url_list = item.get('url_list', [])
-                    index = item.get('index', 0)
-                    logger.warning(f"批量下载媒体失败: {url_list[0] if url_list else 'unknown'}, 错误: {e}")
-                    return {
-                        'url': url_list[0] if url_list else None,
-                        'file_path': None,
-                        'success': False,
-                        'index': index,
-                        'error': str(e)
-                    }
+                finally:
+                    if self._downloading_media.get(media_key) is done:
+                        del self._downloading_media[media_key]
+                    done.set_result(None)
+                
+                return {
+                    'url': url_list[0] if url_list else None,
+                    'file_path': None,
+                    'size_mb': None,
+                    'success': False,
+                    'index': index
+                }
+            except Exception as e:
+                url_list = item.get('url_list', [])
+                index = item.get('index', 0)
+                logger.warning(f"批量下载媒体失败: {url_list[0] if url_list else 'unknown'}, 错误: {e}")
+                return {
+                    'url': url_list[0] if url_list else None,
+                    'file_path': None,
+                    'success': False,
+                    'index': index,
+                    'error': str(e)
+                }
+
+        # 没有可用URL的媒体项直接生成失败结果，不进入下载流程；
+        # 其余媒体项按 (URL列表, 是否视频) 去重
+        unique_items = []
+        item_slots = []
+        slot_by_key = {}
+        for item in media_items:
+            url_list = item.get('url_list')
+            if not url_list or not isinstance(url_list, list):
+                item_slots.append(None)
+                continue
+            key = (tuple(url_list), item.get('is_video'))
+            slot = slot_by_key.get(key)
+            if slot is None:
+                slot = slot_by_key[key] = len(unique_items)
+                unique_items.append(item)
+            item_slots.append(slot)
+
+        if not unique_items:
+            unique_results = []
+        elif len(unique_items) == 1:
+            # 单个媒体（最常见的单图/单视频）直接下载，无需创建工作协程
+            unique_results = [await download_one(unique_items[0])]
+        else:
+            # 固定数量的工作协程依次领取媒体项，任务数为 O(max_concurrent) 而非 O(N)；
+            # 全局信号量仍然保留，用于限制多条消息同时下载时的总并发
+            results: List[Any] = [None] * len(unique_items)
+            pending_items = iter(enumerate(unique_items))
+
+            async def worker() -> None:
+                for slot, item in pending_items:
+                    results[slot] = await download_one(item)
 
-        tasks = [download_one(item) for item in media_items]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        return process_gather_results(results, media_items)
+            await self._gather_tracked(
+                worker() for _ in range(min(max_concurrent, len(unique_items)))
+            )
+            unique_results = process_gather_results(results, unique_items)
+        if len(unique_items) == len(media_items):
+            return unique_results
+
+        download_results = []
+        for item, slot in zip(media_items, item_slots):
+            if slot is None:
+                download_results.append({
+                    'url': None,
+                    'file_path': None,
+                    'success': False,
+                    'index': item.get('index', 0)
+                })
+                continue
+            result = unique_results[slot]
+            if unique_items[slot] is not item:
+                result = {**result, 'index': item.get('index', 0)}
+            download_results.append(result)
+        return download_results
 
     def _process_download_results(
         self,
@@ -548,8 +826,7 @@ class DownloadManager:
         if self._shutting_down:
             return metadata
         
-        if session not in self._active_sessions:
-            self._active_sessions.append(session)
+        self._active_sessions.add(session)
         
         if not metadata:
             return metadata
@@ -652,7 +929,7 @@ class DownloadManager:
                     final_video_sizes, url
                 )
                 if exceeds_limit:
-                    cleanup_files(file_paths)
+                    await cleanup_files_async(file_paths)
                     metadata['exceeds_max_size'] = True
                     metadata['has_valid_media'] = False
                     metadata['use_local_files'] = False
@@ -684,28 +961,34 @@ class DownloadManager:
                 metadata['video_urls'] = []
             
             video_has_access_denied = False
-            if video_urls:
-                if not video_sizes:
-                    video_sizes, video_has_access_denied = await self._check_video_sizes(
-                        session, video_urls, metadata, proxy_addr
-                    )
-            
-            valid_sizes = [s for s in video_sizes if s is not None]
-            max_video_size = max(valid_sizes) if valid_sizes else None
-            total_video_size = sum(valid_sizes) if valid_sizes else 0.0
-            has_valid_videos = len(valid_sizes) > 0
-            
             has_valid_images = False
             has_access_denied = False
             image_file_paths = []
             failed_image_count = 0
             
+            # 视频大小检查与图片下载互不依赖，并发进行，总耗时取两者中较慢的一方
+            pending = {}
+            if video_urls and not video_sizes:
+                pending['video'] = self._check_video_sizes(
+                    session, video_urls, metadata, proxy_addr
+                )
             if image_urls:
-                image_file_paths, failed_image_count = await self._download_images(
+                pending['image'] = self._download_images(
                     session, image_urls, True,
                     metadata, proxy_addr
                 )
-                has_valid_images = any(fp for fp in image_file_paths if fp)
+            if pending:
+                outcomes = dict(zip(pending, await asyncio.gather(*pending.values())))
+                if 'video' in outcomes:
+                    video_sizes, video_has_access_denied = outcomes['video']
+                if 'image' in outcomes:
+                    image_file_paths, failed_image_count = outcomes['image']
+                    has_valid_images = any(fp for fp in image_file_paths if fp)
+            
+            valid_sizes = [s for s in video_sizes if s is not None]
+            max_video_size = max(valid_sizes) if valid_sizes else None
+            total_video_size = sum(valid_sizes) if valid_sizes else 0.0
+            has_valid_videos = len(valid_sizes) > 0
             
             metadata['video_sizes'] = video_sizes
             metadata['max_video_size_mb'] = max_video_size
@@ -778,7 +1061,7 @@ class DownloadManager:
         """
         self._shutting_down = True
         
-        for session in self._active_sessions:
+        for session in list(self._active_sessions):
             if not session.closed:
                 await session.close()
         self._active_sessions.clear()
@@ -790,4 +1073,6 @@ class DownloadManager:
         if self._active_tasks:
             await asyncio.gather(*self._active_tasks, return_exceptions=True)
         self._active_tasks.clear()
+        
+        await cancel_video_size_checks()
 
@@ -8,6 +8,18 @@ from .handler.normal_video import download_video_to_cache
 from .handler.range_video import download_video_to_cache as download_range_video_to_cache
 from .handler.m3u8 import M3U8Handler
 
+# (媒体类型, 扩展名, ".扩展名", ".扩展名?")，按检测优先级排列
+_MEDIA_TYPE_EXTENSIONS = tuple(
+    (media_type, ext, f'.{ext}', f'.{ext}?')
+    for media_type, extensions in (
+        ('image', ('jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'svg')),
+        ('video', ('mp4', 'mkv', 'mov', 'avi', 'flv', 'f4v', 'webm', 'wmv', 'm4v')),
+    )
+    for ext in extensions
+)
+_IMAGE_URL_PATTERN = re.compile(r'[._!-](jpg|jpeg|png|gif|webp|bmp|svg)(_|\d|$)')
+_VIDEO_URL_PATTERN = re.compile(r'[._!-](mp4|mkv|mov|avi|flv|f4v|webm|wmv|m4v|3gp|ts)(_|\d|$)')
+
 
 def detect_media_type(url: str) -> Literal['m3u8', 'image', 'video']:
     """检测媒体类型
@@ -27,34 +39,18 @@ def detect_media_type(url: str) -> Literal['m3u8', 'image', 'video']:
     if '.m3u8' in url_lower:
         return 'm3u8'
     
-    media_types = {
-        'image': ['jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp', 'svg'],
-        'video': ['mp4', 'mkv', 'mov', 'avi', 'flv', 'f4v', 'webm', 'wmv', 'm4v']
-    }
-    
-    for media_type, extensions in media_types.items():
-        for ext in extensions:
-            if url_lower.endswith(f'.{ext}') or f'.{ext}?' in url_lower:
+    for media_type, ext, dot_ext, dot_ext_query in _MEDIA_TYPE_EXTENSIONS:
+        if url_lower.endswith(dot_ext) or dot_ext_query in url_lower:
+            return media_type
+        if url_path.endswith(ext):
+            if len(url_path) == len(ext) or not url_path[-(len(ext) + 1)].isalpha():
                 return media_type
-            if url_path.endswith(ext):
-                if len(url_path) == len(ext) or not url_path[-(len(ext) + 1)].isalpha():
-                    return media_type
-    
-    image_patterns = [
-        r'[._!-](jpg|jpeg|png|gif|webp|bmp|svg)(_|\d|$)',
-    ]
     
-    video_patterns = [
-        r'[._!-](mp4|mkv|mov|avi|flv|f4v|webm|wmv|m4v|3gp|ts)(_|\d|$)',
-    ]
+    if _IMAGE_URL_PATTERN.search(url_lower):
+        return 'image'
     
-    for pattern in image_patterns:
-        if re.search(pattern, url_lower):
-            return 'image'
-    
-    for pattern in video_patterns:
-        if re.search(pattern, url_lower):
-            return 'video'
+    if _VIDEO_URL_PATTERN.search(url_lower):
+        return 'video'
     
     return 'video'
 
@@ -1,6 +1,6 @@
 import os
 import re
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple
 
 try:
     from astrbot.api import logger
@@ -8,6 +8,52 @@ except ImportError:
     import logging
     logger = logging.getLogger(__name__)
 
+from ..constants import Config
+
+# 已确认可写的缓存目录，键为 (路径, inode)，目录被删除重建后 inode 变化会重新检查
+_available_cache_dirs: Set[Tuple[str, int]] = set()
+
+# Content-Range 中总大小部分的兜底匹配（常见格式走字符串快路径，不进入正则）
+_CONTENT_RANGE_TOTAL_RE = re.compile(r'/\s*(\d+)')
+_BYTES_PER_MB = 1024 * 1024
+
+# 图片文件头魔数（前4字节按大端解释为整数），JPEG只比较前3字节，WEBP需额外检查第8-12字节
+_JPEG_MAGIC_24 = 0xFFD8FF
+_PNG_MAGIC = 0x89504E47  # b'\x89PNG'
+_GIF_MAGIC = 0x47494638  # b'GIF8'
+_RIFF_MAGIC = 0x52494646  # b'RIFF'
+
+# 图片Content-Type / URL扩展名到文件后缀的映射，未命中时再做子串匹配
+_IMAGE_CONTENT_TYPE_SUFFIXES = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+}
+_IMAGE_EXTENSION_SUFFIXES = {
+    'jpg': '.jpg',
+    'jpeg': '.jpg',
+    'png': '.png',
+    'webp': '.webp',
+    'gif': '.gif',
+}
+# 视频Content-Type / URL扩展名到文件后缀的映射，未命中时再做子串匹配
+_VIDEO_CONTENT_TYPE_SUFFIXES = {
+    'video/mp4': '.mp4',
+    'video/x-matroska': '.mkv',
+    'video/quicktime': '.mov',
+    'video/x-msvideo': '.avi',
+    'video/x-flv': '.flv',
+    'video/x-f4v': '.f4v',
+    'video/webm': '.webm',
+    'video/x-ms-wmv': '.wmv',
+}
+_VIDEO_EXTENSION_SUFFIXES = {
+    ext: f'.{ext}'
+    for ext in ('mp4', 'mkv', 'mov', 'avi', 'flv', 'f4v', 'webm', 'wmv')
+}
+
 
 def validate_content_type(
     content_type: str,
@@ -66,30 +112,51 @@ def extract_size_from_headers(
 ) -> Optional[float]:
     """从响应头中提取媒体大小
 
+    响应带有非 identity 的 Content-Encoding 时，Content-Length 是压缩后的长度，
+    不代表媒体实际大小，此时忽略该字段。
+
     Args:
         response: HTTP响应对象（aiohttp.ClientResponse）
 
     Returns:
         媒体大小(MB)，无法获取时为None
     """
-    content_range = response.headers.get("Content-Range")
+    headers = response.headers
+    content_range = headers.get("Content-Range")
     if content_range:
-        match = re.search(r'/\s*(\d+)', content_range)
+        total = content_range.rpartition('/')[2].strip()
+        if total.isdigit():
+            return int(total) / _BYTES_PER_MB
+        match = _CONTENT_RANGE_TOTAL_RE.search(content_range)
         if match:
-            size_bytes = int(match.group(1))
-            return size_bytes / (1024 * 1024)
+            return int(match.group(1)) / _BYTES_PER_MB
     
-    content_length = response.headers.get("Content-Length")
-    if content_length:
-        size_bytes = int(content_length)
-        return size_bytes / (1024 * 1024)
+    content_length = headers.get("Content-Length")
+    if content_length and not is_encoded_response(response):
+        return int(content_length) / _BYTES_PER_MB
     
     return None
 
 
+def is_encoded_response(response) -> bool:
+    """判断响应体是否经过压缩编码（Content-Encoding 非空且不是 identity）
+
+    Args:
+        response: HTTP响应对象（aiohttp.ClientResponse）
+
+    Returns:
+        响应体是否经过压缩编码
+    """
+    content_encoding = response.headers.get("Content-Encoding", "").strip().lower()
+    return bool(content_encoding) and content_encoding != "identity"
+
+
 def check_cache_dir_available(cache_dir: str) -> bool:
     """检查缓存目录是否可用（可写）
 
+    使用 os.access 判断写权限，不再创建和删除探测文件；结果按 (路径, inode)
+    缓存。目录之后才变得不可写时，由写入阶段的失败处理兜底。
+
     Args:
         cache_dir: 缓存目录路径
 
@@ -98,22 +165,67 @@ def check_cache_dir_available(cache_dir: str) -> bool:
     """
     if not cache_dir:
         return False
+    cache_dir = os.path.normpath(cache_dir)
     try:
-        os.makedirs(cache_dir, exist_ok=True)
-        test_file = os.path.join(cache_dir, ".test_write")
-        try:
-            with open(test_file, 'w') as f:
-                f.write("test")
-            os.unlink(test_file)
-            return True
-        except Exception as e:
-            logger.warning(f"检查缓存目录写入权限失败: {e}")
+        st = os.stat(cache_dir)
+    except OSError:
+        st = None
+    if st is not None and (cache_dir, st.st_ino) in _available_cache_dirs:
+        return True
+    try:
+        if st is None:
+            os.makedirs(cache_dir, exist_ok=True)
+            st = os.stat(cache_dir)
+        if not os.access(cache_dir, os.W_OK | os.X_OK):
+            logger.warning(f"缓存目录没有写入权限: {cache_dir}")
             return False
+        _available_cache_dirs.add((cache_dir, st.st_ino))
+        return True
     except Exception as e:
         logger.warning(f"检查缓存目录可用性失败: {e}")
         return False
 
 
+def sniff_image_content_type(head: bytes) -> Optional[str]:
+    """根据文件头魔数推断图片的Content-Type
+
+    Args:
+        head: 文件开头的字节（至少12字节才能识别WEBP），通过 memoryview 读取，不产生切片拷贝
+
+    Returns:
+        推断出的Content-Type，无法识别时为None
+    """
+    if not head or len(head) < 4:
+        return None
+    view = memoryview(head)
+    magic = int.from_bytes(view[:4], 'big')
+    if magic >> 8 == _JPEG_MAGIC_24:
+        return 'image/jpeg'
+    if magic == _PNG_MAGIC:
+        return 'image/png'
+    if magic == _GIF_MAGIC:
+        return 'image/gif'
+    if magic == _RIFF_MAGIC and view[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def _url_file_extension(url: str) -> str:
+    """提取URL路径最后一段的扩展名（不含点，小写），忽略查询参数和锚点
+
+    Args:
+        url: URL
+
+    Returns:
+        扩展名，没有扩展名时为空字符串
+    """
+    path = url.partition('?')[0].partition('#')[0]
+    name = path.rpartition('/')[2]
+    if '.' not in name:
+        return ''
+    return name.rpartition('.')[2].lower()
+
+
 def get_image_suffix(content_type: str = None, url: str = None) -> str:
     """根据Content-Type或URL确定图片文件扩展名
 
@@ -125,6 +237,11 @@ def get_image_suffix(content_type: str = None, url: str = None) -> str:
         文件扩展名（.jpg, .png, .webp, .gif），默认返回.jpg
     """
     if content_type:
+        suffix = _IMAGE_CONTENT_TYPE_SUFFIXES.get(
+            content_type.partition(';')[0].strip().lower()
+        )
+        if suffix:
+            return suffix
         if 'jpeg' in content_type or 'jpg' in content_type:
             return '.jpg'
         elif 'png' in content_type:
@@ -135,6 +252,9 @@ def get_image_suffix(content_type: str = None, url: str = None) -> str:
             return '.gif'
 
     if url:
+        suffix = _IMAGE_EXTENSION_SUFFIXES.get(_url_file_extension(url))
+        if suffix:
+            return suffix
         url_lower = url.lower()
         if '.jpg' in url_lower or '.jpeg' in url_lower:
             return '.jpg'
@@ -160,6 +280,11 @@ def get_video_suffix(content_type: str = None, url: str = None) -> str:
     """
     if content_type:
         content_type_lower = content_type.lower()
+        suffix = _VIDEO_CONTENT_TYPE_SUFFIXES.get(
+            content_type_lower.partition(';')[0].strip()
+        )
+        if suffix:
+            return suffix
         if 'mp4' in content_type_lower:
             return '.mp4'
         elif 'matroska' in content_type_lower or 'mkv' in content_type_lower:
@@ -195,6 +320,9 @@ def get_video_suffix(content_type: str = None, url: str = None) -> str:
                 return '.mkv'
 
     if url:
+        suffix = _VIDEO_EXTENSION_SUFFIXES.get(_url_file_extension(url))
+        if suffix:
+            return suffix
         url_lower = url.lower()
         if '.mp4' in url_lower:
             return '.mp4'
@@ -216,44 +344,127 @@ def get_video_suffix(content_type: str = None, url: str = None) -> str:
     return '.mp4'
 
 
+def _failed_download_result(
+    items: List[Dict[str, Any]],
+    i: int,
+    result: Any
+) -> Dict[str, Any]:
+    """为异常或非预期类型的下载结果构造失败结果字典
+
+    Args:
+        items: 原始媒体项列表
+        i: 结果索引
+        result: 原始结果（异常对象或其他非字典值）
+
+    Returns:
+        失败结果字典
+    """
+    item = items[i] if i < len(items) else {}
+    url_list = item.get('url_list', [])
+    return {
+        'url': url_list[0] if url_list else None,
+        'file_path': None,
+        'success': False,
+        'index': item.get('index', i),
+        'error': str(result) if isinstance(result, Exception) else 'Unknown error'
+    }
+
+
 def process_gather_results(
     results: List[Any],
     items: List[Dict[str, Any]]
 ) -> List[Dict[str, Any]]:
     """处理 asyncio.gather 返回的下载结果，统一错误处理逻辑
-    
+
+    正常结果（字典）原样保留，只有异常或非预期类型的结果才构造失败字典。
+
     Args:
         results: asyncio.gather 返回的结果列表（可能包含异常）
         items: 原始媒体项列表
-        
+
     Returns:
         处理后的结果列表，每个项包含url、file_path、success、index等字段
     """
-    processed_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            item = items[i] if i < len(items) else {}
-            url_list = item.get('url_list', [])
-            processed_results.append({
-                'url': url_list[0] if url_list else None,
-                'file_path': None,
-                'success': False,
-                'index': item.get('index', i),
-                'error': str(result)
-            })
-        elif isinstance(result, dict):
-            processed_results.append(result)
-        else:
-            item = items[i] if i < len(items) else {}
-            url_list = item.get('url_list', [])
-            processed_results.append({
-                'url': url_list[0] if url_list else None,
-                'file_path': None,
-                'success': False,
-                'index': item.get('index', i),
-                'error': 'Unknown error'
-            })
-    return processed_results
+    return [
+        result if isinstance(result, dict)
+        else _failed_download_result(items, i, result)
+        for i, result in enumerate(results)
+    ]
+
+
+def find_cached_media_file(
+    cache_dir: str,
+    media_id: str,
+    media_type: str,
+    index: int
+) -> Optional[Tuple[str, int]]:
+    """查找缓存目录中已下载完成的媒体文件
+
+    文件名与 generate_cache_file_path 一致（{media_type}_{index}{suffix}），
+    由于后缀取决于下载时的Content-Type，这里按前缀匹配；
+    下载中的临时文件（.part）与空文件不计入。
+
+    Args:
+        cache_dir: 缓存目录路径
+        media_id: 媒体ID
+        media_type: 媒体类型，'video' 或 'image'
+        index: 媒体索引
+
+    Returns:
+        (file_path, size_bytes) 元组，不存在时为None
+    """
+    cache_subdir = os.path.normpath(os.path.join(cache_dir, media_id))
+    prefix = f"{media_type}_{index}."
+    try:
+        with os.scandir(cache_subdir) as entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.startswith(prefix)
+                    and not name.endswith(Config.PARTIAL_DOWNLOAD_SUFFIX)
+                    and entry.is_file()
+                ):
+                    size = entry.stat().st_size
+                    if size > 0:
+                        return f"{cache_subdir}{os.sep}{name}", size
+    except OSError:
+        pass
+    return None
+
+
+def link_cached_media_file(
+    src_path: str,
+    cache_dir: str,
+    media_id: str,
+    media_type: str,
+    index: int
+) -> Optional[str]:
+    """为已下载的媒体文件在另一个媒体ID下创建硬链接
+
+    不同链接（如转发、镜像）指向同一媒体URL时，直接复用已下载的文件，无需再次下载。
+    使用硬链接而非符号链接，任意一方被清理都不影响另一方。
+
+    Args:
+        src_path: 已下载的文件路径
+        cache_dir: 缓存目录路径
+        media_id: 目标媒体ID
+        media_type: 媒体类型，'video' 或 'image'
+        index: 媒体索引
+
+    Returns:
+        新文件路径，源文件不存在或文件系统不支持硬链接时为None
+    """
+    suffix = os.path.splitext(src_path)[1]
+    cache_subdir = os.path.normpath(os.path.join(cache_dir, media_id))
+    dst_path = f"{cache_subdir}{os.sep}{media_type}_{index}{suffix}"
+    if dst_path == src_path:
+        return dst_path
+    try:
+        os.makedirs(cache_subdir, exist_ok=True)
+        os.link(src_path, dst_path)
+    except OSError:
+        return None
+    return dst_path
 
 
 def generate_cache_file_path(
@@ -284,7 +495,7 @@ def generate_cache_file_path(
         suffix = get_image_suffix(content_type, url)
         filename = f"image_{index}{suffix}"
     
-    cache_subdir = os.path.join(cache_dir, media_id)
+    cache_subdir = os.path.normpath(os.path.join(cache_dir, media_id))
     os.makedirs(cache_subdir, exist_ok=True)
-    return os.path.normpath(os.path.join(cache_subdir, filename))
+    return f"{cache_subdir}{os.sep}{filename}"
 
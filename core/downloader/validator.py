@@ -1,5 +1,7 @@
 import asyncio
-from typing import Optional, Tuple
+import time
+from collections import ChainMap, OrderedDict
+from typing import Dict, Optional, Tuple
 
 import aiohttp
 
@@ -17,6 +19,17 @@ from .utils import (
 from ..constants import Config
 
 _EMPTY_CONTENT_TYPE_CHECK_SIZE = 64
+_SIZE_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=Config.VIDEO_SIZE_CHECK_TIMEOUT)
+_RANGE_PROBE_HEADERS = {'Range': 'bytes=0-0'}
+
+# 视频大小缓存：URL -> (size_mb, 过期时间)，按最近使用顺序排列
+_video_size_cache: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+# 正在进行中的视频大小请求：(URL, 会话) -> Future，同一会话内并发检查同一URL时共享同一次请求；
+# 按会话区分，避免某条消息的会话关闭或被取消时连带影响其他消息的检查
+_video_size_inflight: Dict[
+    Tuple[str, aiohttp.ClientSession],
+    "asyncio.Future[Tuple[Optional[float], Optional[int]]]"
+] = {}
 
 
 async def validate_media_response(
@@ -67,19 +80,108 @@ async def validate_media_response(
     return True, None
 
 
+async def _probe_video_size_with_range(
+    session: aiohttp.ClientSession,
+    video_url: str,
+    headers: dict,
+    proxy: Optional[str],
+    timeout: aiohttp.ClientTimeout
+) -> Optional[Tuple[Optional[float], Optional[int]]]:
+    """使用 Range: bytes=0-0 的GET请求探测视频大小
+
+    不少CDN对HEAD不返回长度，但对单字节Range请求会在Content-Range中给出总大小，
+    一次往返即可得到结果。服务器忽略Range返回完整内容(200)时不读取响应体，
+    直接关闭该连接。
+
+    Args:
+        session: aiohttp会话
+        video_url: 视频URL
+        headers: 请求头（与随后的HEAD/GET共用同一个字典，不会被修改）
+        proxy: 代理地址（可选）
+        timeout: 超时配置
+
+    Returns:
+        (size_mb, status_code) 元组；无法据此得出结论时返回None，由调用方回退到HEAD
+    """
+    request_headers = ChainMap(_RANGE_PROBE_HEADERS, headers)
+    async with session.get(
+        video_url,
+        headers=request_headers,
+        timeout=timeout,
+        proxy=proxy,
+        allow_redirects=True
+    ) as response:
+        if response.status == 403:
+            logger.warning(f"视频URL访问被拒绝(403 Forbidden): {video_url}")
+            return None, 403
+        if response.status == 206:
+            # 读完单字节响应体，连接才能放回连接池复用；未读完的连接会被直接关闭
+            await response.read()
+            if not response.headers.get('Content-Range'):
+                return None
+            size = extract_size_from_headers(response)
+            if size is not None:
+                return size, None
+        return None
+
+
+def get_cached_video_size(video_url: str) -> Optional[float]:
+    """从缓存中读取视频大小，过期条目会被移除
+
+    下载阶段可据此复用大小检查阶段已经拿到的结果，无需再次探测。
+
+    Args:
+        video_url: 视频URL（不带 m3u8:/range: 前缀）
+
+    Returns:
+        视频大小(MB)，未命中或已过期时为None
+    """
+    entry = _video_size_cache.get(video_url)
+    if entry is None:
+        return None
+    size_mb, expires_at = entry
+    if expires_at <= time.monotonic():
+        del _video_size_cache[video_url]
+        return None
+    _video_size_cache.move_to_end(video_url)
+    return size_mb
+
+
+def _store_video_size(video_url: str, size_mb: float) -> None:
+    """写入视频大小缓存，超过容量时淘汰最久未使用的条目
+
+    Args:
+        video_url: 视频URL
+        size_mb: 视频大小(MB)
+    """
+    _video_size_cache[video_url] = (
+        size_mb,
+        time.monotonic() + Config.VIDEO_SIZE_CACHE_TTL
+    )
+    _video_size_cache.move_to_end(video_url)
+    while len(_video_size_cache) > Config.VIDEO_SIZE_CACHE_MAX_ENTRIES:
+        _video_size_cache.popitem(last=False)
+
+
 async def get_video_size(
     session: aiohttp.ClientSession,
     video_url: str,
     headers: dict = None,
-    proxy: str = None
+    proxy: str = None,
+    use_range_probe: bool = Config.VIDEO_SIZE_RANGE_PROBE
 ) -> Tuple[Optional[float], Optional[int]]:
     """获取视频文件大小
 
+    成功获取的大小会按URL缓存一段时间，重复解析同一链接时不再发起请求；
+    失败结果（包括403）不缓存，下次仍会重新请求。同一会话内对同一URL的
+    并发检查共享同一次网络请求。
+
     Args:
         session: aiohttp会话
         video_url: 视频URL
         headers: 请求头（可选）
         proxy: 代理地址（可选）
+        use_range_probe: 是否先用单字节Range请求探测大小，失败时回退到HEAD
 
     Returns:
         (size_mb, status_code) 元组，size_mb为视频大小(MB)，无法获取时为None，
@@ -90,9 +192,73 @@ async def get_video_size(
     elif video_url.startswith('range:'):
         video_url = video_url[6:]
     
+    cached_size = get_cached_video_size(video_url)
+    if cached_size is not None:
+        return cached_size, None
+    
+    inflight_key = (video_url, session)
+    inflight = _video_size_inflight.get(inflight_key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+    
+    fetch = asyncio.ensure_future(
+        _fetch_video_size(session, video_url, headers, proxy, use_range_probe)
+    )
+    _video_size_inflight[inflight_key] = fetch
     try:
-        request_headers = headers or {}
-        timeout = aiohttp.ClientTimeout(total=Config.VIDEO_SIZE_CHECK_TIMEOUT)
+        size_mb, status_code = await asyncio.shield(fetch)
+    finally:
+        if _video_size_inflight.get(inflight_key) is fetch:
+            del _video_size_inflight[inflight_key]
+    if size_mb is not None:
+        _store_video_size(video_url, size_mb)
+    return size_mb, status_code
+
+
+async def cancel_video_size_checks() -> None:
+    """取消所有进行中的视频大小请求并等待其结束（插件关闭时调用）"""
+    pending = list(_video_size_inflight.values())
+    _video_size_inflight.clear()
+    for fetch in pending:
+        fetch.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _fetch_video_size(
+    session: aiohttp.ClientSession,
+    video_url: str,
+    headers: Optional[dict],
+    proxy: Optional[str],
+    use_range_probe: bool
+) -> Tuple[Optional[float], Optional[int]]:
+    """通过网络请求获取视频文件大小
+
+    请求显式声明 Accept-Encoding: identity，避免CDN返回压缩后的 Content-Length。
+
+    Args:
+        session: aiohttp会话
+        video_url: 视频URL（已去除 m3u8:/range: 前缀）
+        headers: 请求头（可选）
+        proxy: 代理地址（可选）
+        use_range_probe: 是否先用单字节Range请求探测大小
+
+    Returns:
+        (size_mb, status_code) 元组
+    """
+    try:
+        request_headers = {**(headers or {}), 'Accept-Encoding': 'identity'}
+        timeout = _SIZE_CHECK_TIMEOUT
+        
+        if use_range_probe:
+            try:
+                probed = await _probe_video_size_with_range(
+                    session, video_url, request_headers, proxy, timeout
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                probed = None
+            if probed is not None:
+                return probed
         
         try:
             async with session.head(
@@ -165,7 +331,7 @@ async def validate_media_url(
     
     try:
         request_headers = headers or {}
-        timeout = aiohttp.ClientTimeout(total=Config.VIDEO_SIZE_CHECK_TIMEOUT)
+        timeout = _SIZE_CHECK_TIMEOUT
         
         try:
             async with session.head(
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import shutil
 from typing import List, Optional
@@ -18,16 +19,17 @@ def cleanup_file(file_path: str) -> bool:
     Returns:
         是否成功
     """
-    if not file_path or not os.path.exists(file_path):
+    if not file_path:
         return True
     
     try:
-        if os.path.isfile(file_path):
-            os.unlink(file_path)
-            return True
-        else:
-            logger.warning(f"路径不是文件: {file_path}")
-            return False
+        os.unlink(file_path)
+        return True
+    except FileNotFoundError:
+        return True
+    except IsADirectoryError:
+        logger.warning(f"路径不是文件: {file_path}")
+        return False
     except Exception as e:
         logger.warning(f"清理文件失败: {file_path}, 错误: {e}")
         return False
@@ -36,6 +38,8 @@ def cleanup_file(file_path: str) -> bool:
 def cleanup_files(file_paths: List[str]) -> None:
     """清理文件列表
 
+    逐个直接删除，不预先检查文件是否存在（不存在视为已清理）。
+
     Args:
         file_paths: 文件路径列表
     """
@@ -43,6 +47,17 @@ def cleanup_files(file_paths: List[str]) -> None:
         cleanup_file(file_path)
 
 
+async def cleanup_files_async(file_paths: List[str]) -> None:
+    """在线程中清理文件列表，供异步代码调用，避免删除大量文件时阻塞事件循环
+
+    Args:
+        file_paths: 文件路径列表
+    """
+    if not file_paths:
+        return
+    await asyncio.to_thread(cleanup_files, list(file_paths))
+
+
 def cleanup_directory(dir_path: str, ignore_errors: bool = True) -> bool:
     """清理目录及其所有内容
 
@@ -53,16 +68,18 @@ def cleanup_directory(dir_path: str, ignore_errors: bool = True) -> bool:
     Returns:
         是否成功
     """
-    if not dir_path or not os.path.exists(dir_path):
+    if not dir_path:
         return True
     
     try:
+        # 常见情况（目录存在）只需一次 stat；仅在不是目录时再区分"不存在"与"不是目录"
         if os.path.isdir(dir_path):
             shutil.rmtree(dir_path, ignore_errors=ignore_errors)
             return True
-        else:
-            logger.warning(f"路径不是目录: {dir_path}")
-            return False
+        if not os.path.lexists(dir_path):
+            return True
+        logger.warning(f"路径不是目录: {dir_path}")
+        return False
     except Exception as e:
         if ignore_errors:
             logger.warning(f"清理目录失败: {dir_path}, 错误: {e}")
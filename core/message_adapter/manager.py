@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from .node_builder import build_all_nodes
 from .sender import MessageSender
@@ -6,13 +6,15 @@ from .sender import MessageSender
 
 class MessageManager:
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, cache_dir: Optional[str] = None):
         """初始化消息管理器
 
         Args:
             logger: 日志记录器（可选）
+            cache_dir: 插件缓存目录（可选）
         """
         self.logger = logger
+        self.cache_dir = cache_dir
         self.sender = MessageSender(logger=logger)
 
     def get_sender_info(self, event) -> tuple:
@@ -48,7 +50,8 @@ class MessageManager:
             metadata_list,
             is_auto_pack,
             large_video_threshold_mb,
-            max_video_size_mb
+            max_video_size_mb,
+            self.cache_dir
         )
 
     async def send_results(
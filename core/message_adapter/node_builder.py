@@ -1,5 +1,6 @@
 import os
-from typing import Dict, Any, List, Optional, Tuple, Union
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 
 try:
     from astrbot.api import logger
@@ -98,15 +99,60 @@ def build_text_node(metadata: Dict[str, Any], max_video_size_mb: float = 0.0) ->
     return Plain(desc_text)
 
 
+def _existing_files(
+    file_paths: List[Optional[str]],
+    cache_dir: Optional[str] = None
+) -> Set[str]:
+    """批量检查文件是否存在
+
+    插件缓存目录下的文件按所在目录分组，每个目录只做一次 os.scandir，
+    代替逐个文件 stat（缓存子目录只存放本插件下载的媒体，条目很少）；
+    其他位置（如系统临时目录，可能包含大量无关文件）的文件逐个检查。
+
+    Args:
+        file_paths: 文件路径列表（可包含None）
+        cache_dir: 插件缓存目录（可选）
+
+    Returns:
+        存在的文件路径集合
+    """
+    cache_prefix = os.path.join(os.path.normpath(cache_dir), '') if cache_dir else None
+    paths_by_dir = defaultdict(list)
+    existing = set()
+    for path in file_paths:
+        if not path:
+            continue
+        parent = os.path.dirname(path)
+        if cache_prefix and os.path.join(parent, '').startswith(cache_prefix):
+            paths_by_dir[parent].append(path)
+        elif os.path.exists(path):
+            existing.add(path)
+    
+    for parent, paths in paths_by_dir.items():
+        if len(paths) == 1:
+            if os.path.exists(paths[0]):
+                existing.add(paths[0])
+            continue
+        try:
+            with os.scandir(parent or '.') as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            continue
+        existing.update(p for p in paths if os.path.basename(p) in names)
+    return existing
+
+
 def build_media_nodes(
     metadata: Dict[str, Any],
-    use_local_files: bool = False
+    use_local_files: bool = False,
+    cache_dir: Optional[str] = None
 ) -> List[Union[Image, Video]]:
     """构建媒体节点
 
     Args:
         metadata: 元数据字典
         use_local_files: 是否使用本地文件
+        cache_dir: 插件缓存目录（可选，用于批量检查本地文件是否存在）
 
     Returns:
         媒体节点列表（Image或Video节点）
@@ -142,10 +188,11 @@ def build_media_nodes(
         logger.debug(f"无媒体内容，跳过节点构建: {url}")
         return nodes
     
+    existing_files = _existing_files(file_paths, cache_dir) if use_local_files else set()
     file_idx = 0
     
     for idx, url_list in enumerate(video_urls):
-        if not url_list or not isinstance(url_list, list):
+        if not url_list:
             file_idx += 1
             continue
         
@@ -153,7 +200,7 @@ def build_media_nodes(
             file_idx += 1
             continue
         
-        video_url = url_list[0] if url_list else None
+        video_url = url_list[0]
         if not video_url:
             file_idx += 1
             continue
@@ -162,7 +209,7 @@ def build_media_nodes(
         if use_local_files and file_idx < len(file_paths):
             video_file_path = file_paths[file_idx]
         
-        if use_local_files and video_file_path and os.path.exists(video_file_path):
+        if use_local_files and video_file_path in existing_files:
             try:
                 nodes.append(Video.fromFileSystem(video_file_path))
             except Exception as e:
@@ -182,11 +229,11 @@ def build_media_nodes(
         file_idx += 1
     
     for url_list in image_urls:
-        if not url_list or not isinstance(url_list, list):
+        if not url_list:
             file_idx += 1
             continue
         
-        image_url = url_list[0] if url_list else None
+        image_url = url_list[0]
         if not image_url:
             file_idx += 1
             continue
@@ -195,7 +242,7 @@ def build_media_nodes(
         if use_local_files and file_idx < len(file_paths):
             image_file_path = file_paths[file_idx]
         
-        if use_local_files and image_file_path:
+        if use_local_files and image_file_path in existing_files:
             try:
                 nodes.append(Image.fromFileSystem(image_file_path))
             except Exception as e:
@@ -216,7 +263,8 @@ def build_media_nodes(
 def build_nodes_for_link(
     metadata: Dict[str, Any],
     use_local_files: bool = False,
-    max_video_size_mb: float = 0.0
+    max_video_size_mb: float = 0.0,
+    cache_dir: Optional[str] = None
 ) -> List[Union[Plain, Image, Video]]:
     """构建单个链接的节点列表
 
@@ -224,6 +272,7 @@ def build_nodes_for_link(
         metadata: 元数据字典
         use_local_files: 是否使用本地文件
         max_video_size_mb: 最大允许的视频大小(MB)，用于显示详细的错误信息
+        cache_dir: 插件缓存目录（可选）
 
     Returns:
         节点列表（Plain、Image、Video对象）
@@ -234,37 +283,42 @@ def build_nodes_for_link(
     if text_node:
         nodes.append(text_node)
     
-    media_nodes = build_media_nodes(metadata, use_local_files)
+    media_nodes = build_media_nodes(metadata, use_local_files, cache_dir)
     nodes.extend(media_nodes)
     
     return nodes
 
 
-def is_pure_image_gallery(nodes: List[Union[Plain, Image, Video]]) -> bool:
-    """判断节点列表是否是纯图片图集
+def classify_nodes(
+    nodes: List[Union[Plain, Image, Video]]
+) -> Tuple[List[Plain], List[Image], bool]:
+    """单次遍历节点列表，按类型分组
 
     Args:
         nodes: 节点列表
 
     Returns:
-        是否为纯图片图集
+        包含(texts, images, has_video)的元组；images非空且has_video为False时即为纯图片图集
     """
+    texts = []
+    images = []
     has_video = False
-    has_image = False
     for node in nodes:
-        if isinstance(node, Video):
-            has_video = True
-            break
+        if isinstance(node, Plain):
+            texts.append(node)
         elif isinstance(node, Image):
-            has_image = True
-    return has_image and not has_video
+            images.append(node)
+        elif isinstance(node, Video):
+            has_video = True
+    return texts, images, has_video
 
 
 def build_all_nodes(
     metadata_list: List[Dict[str, Any]],
     is_auto_pack: bool,
     large_video_threshold_mb: float = 0.0,
-    max_video_size_mb: float = 0.0
+    max_video_size_mb: float = 0.0,
+    cache_dir: Optional[str] = None
 ) -> Tuple[List[List[Union[Plain, Image, Video]]], List[Dict], List[str], List[str]]:
     """构建所有链接的节点，处理消息打包逻辑
 
@@ -273,6 +327,7 @@ def build_all_nodes(
         is_auto_pack: 是否打包为Node
         large_video_threshold_mb: 大视频阈值(MB)
         max_video_size_mb: 最大允许的视频大小(MB)，用于显示错误信息
+        cache_dir: 插件缓存目录（可选）
 
     Returns:
         包含(all_link_nodes, link_metadata, temp_files, video_files)的元组
@@ -304,7 +359,8 @@ def build_all_nodes(
         link_nodes = build_nodes_for_link(
             metadata,
             use_local_files,
-            max_video_size_mb
+            max_video_size_mb,
+            cache_dir
         )
         
         logger.debug(f"节点构建完成[{idx}]: {url}, 节点数量: {len(link_nodes)}")
@@ -1,10 +1,13 @@
 from typing import Any, List
 
 from astrbot.api.event import AstrMessageEvent
-from astrbot.api.message_components import Nodes, Plain, Image, Node
+from astrbot.api.message_components import Nodes, Plain, Node
 
-from .node_builder import is_pure_image_gallery
-from ..file_cleaner import cleanup_files
+from .node_builder import classify_nodes
+from ..file_cleaner import cleanup_files_async
+
+# 这些平台的机器人ID不是数字，发送者ID保持原样
+NON_NUMERIC_ID_PLATFORMS = frozenset(("wechatpadpro", "webchat", "gewechat"))
 
 
 class MessageSender:
@@ -29,7 +32,7 @@ class MessageSender:
         sender_name = "视频解析bot"
         platform = event.get_platform_name()
         sender_id = event.get_self_id()
-        if platform not in ("wechatpadpro", "webchat", "gewechat"):
+        if platform not in NON_NUMERIC_ID_PLATFORMS:
             try:
                 sender_id = int(sender_id)
             except (ValueError, TypeError):
@@ -53,22 +56,24 @@ class MessageSender:
             sender_id: 发送者ID
             large_video_threshold_mb: 大视频阈值(MB)
         """
-        normal_metadata = [
-            meta for meta in link_metadata if meta.get('is_normal', True)
-        ]
-        large_media_metadata = [
-            meta for meta in link_metadata if meta.get('is_large_media', False)
-        ]
-        normal_link_nodes = [
-            meta['link_nodes'] for meta in normal_metadata
-        ]
-        large_media_link_nodes = [
-            meta['link_nodes'] for meta in large_media_metadata
-        ]
+        normal_metadata = []
+        large_media_metadata = []
+        normal_link_nodes = []
+        large_media_link_nodes = []
+        for meta in link_metadata:
+            if meta.get('is_normal', True):
+                normal_metadata.append(meta)
+                normal_link_nodes.append(meta['link_nodes'])
+            if meta.get('is_large_media', False):
+                large_media_metadata.append(meta)
+                large_media_link_nodes.append(meta['link_nodes'])
         separator = "-------------------------------------"
 
         if normal_link_nodes:
             flat_nodes = []
+            append = flat_nodes.append
+            extend = flat_nodes.extend
+            last_link_idx = len(normal_link_nodes) - 1
             normal_video_files_to_cleanup = []
             for link_idx, link_nodes in enumerate(normal_link_nodes):
                 if link_idx < len(normal_metadata):
@@ -80,37 +85,25 @@ class MessageSender:
                         normal_video_files_to_cleanup.extend(
                             link_video_files
                         )
-                if is_pure_image_gallery(link_nodes):
-                    texts = [
-                        node for node in link_nodes
-                        if isinstance(node, Plain)
-                    ]
-                    images = [
-                        node for node in link_nodes
-                        if isinstance(node, Image)
-                    ]
-                    for text in texts:
-                        flat_nodes.append(Node(
-                            name=sender_name,
-                            uin=sender_id,
-                            content=[text]
-                        ))
-                    if images:
-                        flat_nodes.append(Node(
-                            name=sender_name,
-                            uin=sender_id,
-                            content=images
-                        ))
+                texts, images, has_video = classify_nodes(link_nodes)
+                if images and not has_video:
+                    extend(
+                        Node(name=sender_name, uin=sender_id, content=[text])
+                        for text in texts
+                    )
+                    append(Node(
+                        name=sender_name,
+                        uin=sender_id,
+                        content=images
+                    ))
                 else:
-                    for node in link_nodes:
-                        if node is not None:
-                            flat_nodes.append(Node(
-                                name=sender_name,
-                                uin=sender_id,
-                                content=[node]
-                            ))
-                if link_idx < len(normal_link_nodes) - 1:
-                    flat_nodes.append(Node(
+                    extend(
+                        Node(name=sender_name, uin=sender_id, content=[node])
+                        for node in link_nodes
+                        if node is not None
+                    )
+                if link_idx < last_link_idx:
+                    append(Node(
                         name=sender_name,
                         uin=sender_id,
                         content=[Plain(separator)]
@@ -119,7 +112,7 @@ class MessageSender:
                 try:
                     await event.send(event.chain_result([Nodes(flat_nodes)]))
                 finally:
-                    cleanup_files(normal_video_files_to_cleanup)
+                    await cleanup_files_async(normal_video_files_to_cleanup)
 
         if large_media_link_nodes:
             await self.send_large_media_results(
@@ -169,18 +162,15 @@ class MessageSender:
                     link_video_files = metadata[link_idx].get('video_files', [])
                 all_video_files_to_cleanup.extend(link_video_files)
                 try:
+                    # 同一链接内的节点按构建顺序逐个发送，保证文本与各媒体的先后次序
                     for node in link_nodes:
                         if node is not None:
-                            try:
-                                await event.send(event.chain_result([node]))
-                            except Exception as e:
-                                if self.logger:
-                                    self.logger.warning(f"发送大媒体节点失败: {e}")
+                            await self._send_large_media_node(event, node)
                 except Exception as e:
                     if self.logger:
                         self.logger.warning(f"发送大媒体链接失败: {e}")
                 finally:
-                    cleanup_files(link_video_files)
+                    await cleanup_files_async(link_video_files)
                 if link_idx < len(link_nodes_list) - 1:
                     try:
                         await event.send(event.plain_result(separator))
@@ -190,9 +180,22 @@ class MessageSender:
         except Exception as e:
             if self.logger:
                 self.logger.exception(f"发送大媒体结果失败: {e}")
-            cleanup_files(all_video_files_to_cleanup)
+            await cleanup_files_async(all_video_files_to_cleanup)
             raise
 
+    async def _send_large_media_node(self, event: AstrMessageEvent, node):
+        """发送单个大媒体节点，失败时仅记录日志
+
+        Args:
+            event: 消息事件对象
+            node: 待发送的节点
+        """
+        try:
+            await event.send(event.chain_result([node]))
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"发送大媒体节点失败: {e}")
+
     async def send_unpacked_results(
         self,
         event: AstrMessageEvent,
@@ -212,15 +215,8 @@ class MessageSender:
         ):
             link_video_files = metadata.get('video_files', [])
             try:
-                if is_pure_image_gallery(link_nodes):
-                    texts = [
-                        node for node in link_nodes
-                        if isinstance(node, Plain)
-                    ]
-                    images = [
-                        node for node in link_nodes
-                        if isinstance(node, Image)
-                    ]
+                texts, images, has_video = classify_nodes(link_nodes)
+                if images and not has_video:
                     for text in texts:
                         await event.send(event.chain_result([text]))
                     if images:
@@ -234,7 +230,7 @@ class MessageSender:
                                 if self.logger:
                                     self.logger.warning(f"发送节点失败: {e}")
             finally:
-                cleanup_files(link_video_files)
+                await cleanup_files_async(link_video_files)
             if link_idx < len(all_link_nodes) - 1:
                 await event.send(event.plain_result(separator))
 
@@ -1,5 +1,5 @@
 import asyncio
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 import aiohttp
 
@@ -27,9 +27,9 @@ class ParserManager:
         """
         if not parsers:
             raise ValueError("parsers 参数不能为空")
-        self.parsers = parsers
+        self.parsers = tuple(parsers)
         self.logger = logger
-        self.link_router = LinkRouter(parsers)
+        self.link_router = LinkRouter(self.parsers)
 
     def find_parser(self, url: str) -> Optional[BaseVideoParser]:
         """根据URL查找合适的解析器
@@ -62,13 +62,16 @@ class ParserManager:
     async def parse_text(
         self,
         text: str,
-        session: aiohttp.ClientSession
+        session: aiohttp.ClientSession,
+        on_parsed: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> List[Dict[str, Any]]:
         """解析文本中的所有链接
 
         Args:
             text: 输入文本
             session: aiohttp会话
+            on_parsed: 单个链接解析成功后立即调用的回调（可选），
+                调用方可据此提前开始处理该链接的媒体，无需等待其他链接解析完成
 
         Returns:
             解析结果字典列表（元数据列表）
@@ -79,15 +82,23 @@ class ParserManager:
             return []
         unique_links = {link: parser for link, parser in links_with_parser}
         self.logger.debug(f"需要解析 {len(unique_links)} 个链接")
+
+        async def parse_one(url: str, parser: BaseVideoParser) -> Optional[Dict[str, Any]]:
+            result = await parser.parse(session, url)
+            if result:
+                if 'platform' not in result:
+                    result['platform'] = parser.name
+                if on_parsed is not None:
+                    on_parsed(result)
+            return result
+
         tasks = [
-            parser.parse(session, url)
+            parse_one(url, parser)
             for url, parser in unique_links.items()
         ]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         metadata_list = []
-        for i, result in enumerate(results):
-            url = list(unique_links.keys())[i]
-            parser = unique_links[url]
+        for (url, parser), result in zip(unique_links.items(), results):
             if isinstance(result, Exception):
                 if isinstance(result, SkipParse):
                     self.logger.debug(f"跳过解析: {url}, 原因: {result}")
@@ -1,12 +1,17 @@
-from .bilibili import BilibiliParser
-from .douyin import DouyinParser
-from .kuaishou import KuaishouParser
-from .weibo import WeiboParser
-from .xiaohongshu import XiaohongshuParser
-from .xiaoheihe import XiaoheiheParser
-from .twitter import TwitterParser
+import importlib
+
 from .base import BaseVideoParser
 
+_LAZY_PARSERS = {
+    'BilibiliParser': '.bilibili',
+    'DouyinParser': '.douyin',
+    'KuaishouParser': '.kuaishou',
+    'WeiboParser': '.weibo',
+    'XiaohongshuParser': '.xiaohongshu',
+    'XiaoheiheParser': '.xiaoheihe',
+    'TwitterParser': '.twitter',
+}
+
 __all__ = [
     'BilibiliParser',
     'DouyinParser',
@@ -18,3 +23,26 @@ __all__ = [
     'BaseVideoParser'
 ]
 
+
+def __getattr__(name: str):
+    """首次访问时才导入对应平台的解析器模块，未启用的平台不会被加载
+
+    Args:
+        name: 属性名
+
+    Returns:
+        解析器类
+
+    Raises:
+        AttributeError: 属性不存在时
+    """
+    module_name = _LAZY_PARSERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    parser_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = parser_class
+    return parser_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_PARSERS))
@@ -12,6 +12,10 @@ except ImportError:
 
 class BaseVideoParser(ABC):
 
+    # 链接线索正则（忽略大小写），文本中出现匹配时才调用 extract_links；
+    # 须覆盖 extract_links 能提取的所有情况，为 None 时总是调用
+    LINK_HINT_PATTERN: Optional[str] = None
+
     def __init__(self, name: str):
         """初始化视频解析器基类
 
@@ -37,6 +41,8 @@ class BaseVideoParser(ABC):
     def extract_links(self, text: str) -> List[str]:
         """从文本中提取链接
 
+        每条消息都会调用，所用正则应在模块级预编译。
+
         Args:
             text: 输入文本
 
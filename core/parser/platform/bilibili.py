@@ -28,6 +28,35 @@ EP_PATH_RE = re.compile(r"/bangumi/play/ep(\d+)", re.IGNORECASE)
 EP_QS_RE = re.compile(r"(?:^|[?&])ep_id=(\d+)", re.IGNORECASE)
 OPUS_RE = re.compile(r"/opus/(\d+)", re.IGNORECASE)
 T_BILIBILI_RE = re.compile(r"t\.bilibili\.com/(\d+)", re.IGNORECASE)
+BILIBILI_DOMAINS = r"(?:www|m|mobile)\.bilibili\.com"
+B23_LINK_RE = re.compile(r'https?://[Bb]23\.tv/[^\s<>"\'()]+', re.IGNORECASE)
+BV_LINK_RE = re.compile(
+    rf'https?://{BILIBILI_DOMAINS}/video/'
+    rf'([Bb][Vv][0-9A-Za-z]{{10,}})[^\s<>"\'()]*',
+    re.IGNORECASE
+)
+AV_LINK_RE = re.compile(
+    rf'https?://{BILIBILI_DOMAINS}/video/'
+    rf'[Aa][Vv](\d+)[^\s<>"\'()]*',
+    re.IGNORECASE
+)
+EP_LINK_RE = re.compile(
+    rf'https?://{BILIBILI_DOMAINS}/bangumi/play/'
+    rf'ep(\d+)[^\s<>"\'()]*',
+    re.IGNORECASE
+)
+BV_STANDALONE_RE = re.compile(r'\b[Bb][Vv][0-9A-Za-z]{10,}\b', re.IGNORECASE)
+AV_STANDALONE_RE = re.compile(r'\b[Aa][Vv](\d+)\b', re.IGNORECASE)
+OPUS_LINK_RE = re.compile(
+    rf'https?://{BILIBILI_DOMAINS}/opus/'
+    rf'(\d+)[^\s<>"\'()]*',
+    re.IGNORECASE
+)
+T_BILIBILI_LINK_RE = re.compile(
+    r'https?://t\.bilibili\.com/'
+    r'(\d+)[^\s<>"\'()]*',
+    re.IGNORECASE
+)
 BV_TABLE = "FcwAPNKTMug3GV5Lj7EJnHpWsx4tb8haYeviqBz6rkCy12mUSDQX9RdoZf"
 XOR_CODE = 23442827791579
 MAX_AID = 1 << 51
@@ -62,6 +91,8 @@ def av2bv(av: int) -> str:
 
 class BilibiliParser(BaseVideoParser):
 
+    LINK_HINT_PATTERN = r"b23\.tv|bilibili\.com|\bbv[0-9a-z]{10}|\bav\d"
+
     def __init__(self):
         """初始化B站解析器"""
         super().__init__("bilibili")
@@ -209,17 +240,10 @@ class BilibiliParser(BaseVideoParser):
         result_links_set = set()
         seen_ids = set()
         
-        b23_pattern = r'https?://[Bb]23\.tv/[^\s<>"\'()]+'
-        b23_links = re.findall(b23_pattern, text, re.IGNORECASE)
+        b23_links = B23_LINK_RE.findall(text)
         result_links_set.update(b23_links)
         
-        bilibili_domains = r'(?:www|m|mobile)\.bilibili\.com'
-        
-        bv_url_pattern = (
-            rf'https?://{bilibili_domains}/video/'
-            rf'([Bb][Vv][0-9A-Za-z]{{10,}})[^\s<>"\'()]*'
-        )
-        bv_url_matches = re.finditer(bv_url_pattern, text, re.IGNORECASE)
+        bv_url_matches = BV_LINK_RE.finditer(text)
         for match in bv_url_matches:
             bvid = match.group(1)
             if bvid[0:2].upper() != "BV":
@@ -230,11 +254,7 @@ class BilibiliParser(BaseVideoParser):
                 normalized_url = f"https://www.bilibili.com/video/{bvid}"
                 result_links_set.add(normalized_url)
         
-        av_url_pattern = (
-            rf'https?://{bilibili_domains}/video/'
-            rf'[Aa][Vv](\d+)[^\s<>"\'()]*'
-        )
-        av_url_matches = re.finditer(av_url_pattern, text, re.IGNORECASE)
+        av_url_matches = AV_LINK_RE.finditer(text)
         for match in av_url_matches:
             av_num = match.group(1)
             av_key = f"AV:{av_num}"
@@ -243,11 +263,7 @@ class BilibiliParser(BaseVideoParser):
                 av_url = f"https://www.bilibili.com/video/av{av_num}"
                 result_links_set.add(av_url)
         
-        ep_url_pattern = (
-            rf'https?://{bilibili_domains}/bangumi/play/'
-            rf'ep(\d+)[^\s<>"\'()]*'
-        )
-        ep_url_matches = re.finditer(ep_url_pattern, text, re.IGNORECASE)
+        ep_url_matches = EP_LINK_RE.finditer(text)
         for match in ep_url_matches:
             ep_id = match.group(1)
             ep_key = f"EP:{ep_id}"
@@ -256,12 +272,7 @@ class BilibiliParser(BaseVideoParser):
                 ep_url = f"https://www.bilibili.com/bangumi/play/ep{ep_id}"
                 result_links_set.add(ep_url)
         
-        bv_standalone_pattern = r'\b[Bb][Vv][0-9A-Za-z]{10,}\b'
-        bv_standalone_matches = re.finditer(
-            bv_standalone_pattern,
-            text,
-            re.IGNORECASE
-        )
+        bv_standalone_matches = BV_STANDALONE_RE.finditer(text)
         for match in bv_standalone_matches:
             bvid = match.group(0)
             if bvid[0:2].upper() != "BV":
@@ -278,12 +289,7 @@ class BilibiliParser(BaseVideoParser):
                     bv_url = f"https://www.bilibili.com/video/{bvid}"
                     result_links_set.add(bv_url)
         
-        av_standalone_pattern = r'\b[Aa][Vv](\d+)\b'
-        av_standalone_matches = re.finditer(
-            av_standalone_pattern,
-            text,
-            re.IGNORECASE
-        )
+        av_standalone_matches = AV_STANDALONE_RE.finditer(text)
         for match in av_standalone_matches:
             av_num = match.group(1)
             av_key = f"AV:{av_num}"
@@ -298,11 +304,7 @@ class BilibiliParser(BaseVideoParser):
                     av_url = f"https://www.bilibili.com/video/av{av_num}"
                     result_links_set.add(av_url)
 
-        opus_pattern = (
-            rf'https?://(?:www|m|mobile)\.bilibili\.com/opus/'
-            rf'(\d+)[^\s<>"\'()]*'
-        )
-        opus_matches = re.finditer(opus_pattern, text, re.IGNORECASE)
+        opus_matches = OPUS_LINK_RE.finditer(text)
         for match in opus_matches:
             opus_id = match.group(1)
             opus_key = f"OPUS:{opus_id}"
@@ -311,11 +313,7 @@ class BilibiliParser(BaseVideoParser):
                 opus_url = f"https://www.bilibili.com/opus/{opus_id}"
                 result_links_set.add(opus_url)
 
-        t_bilibili_pattern = (
-            r'https?://t\.bilibili\.com/'
-            r'(\d+)[^\s<>"\'()]*'
-        )
-        t_bilibili_matches = re.finditer(t_bilibili_pattern, text, re.IGNORECASE)
+        t_bilibili_matches = T_BILIBILI_LINK_RE.finditer(text)
         for match in t_bilibili_matches:
             dynamic_id = match.group(1)
             dynamic_key = f"T:{dynamic_id}"
@@ -16,18 +16,51 @@ from .base import BaseVideoParser
 from ..utils import build_request_headers, is_live_url, SkipParse
 from ...constants import Config
 
+MOBILE_USER_AGENT = (
+    'Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/116.0.0.0 Mobile Safari/537.36'
+)
+MEDIA_REFERER = "https://www.douyin.com/"
+# 媒体请求头对所有链接都相同，模块加载时构建一次，每条结果复制使用
+_IMAGE_HEADERS = build_request_headers(
+    is_video=False,
+    referer=MEDIA_REFERER,
+    user_agent=MOBILE_USER_AGENT
+)
+_VIDEO_HEADERS = build_request_headers(
+    is_video=True,
+    referer=MEDIA_REFERER,
+    user_agent=MOBILE_USER_AGENT
+)
+
+# 短链、笔记、视频与含19位ID的网页链接合并为一个模式，一次扫描即可按分组区分类型
+DOUYIN_LINK_RE = re.compile(
+    r'(?P<mobile>https?://v\.douyin\.com/[^\s]+)'
+    r'|https?://(?:www\.)?douyin\.com/(?:'
+    r'note/(?P<note>\d+)'
+    r'|video/(?P<video>\d+)'
+    r'|[^\s]*?(?P<web>\d{19})[^\s]*'
+    r')'
+)
+NOTE_ID_RE = re.compile(r'/note/(\d+)')
+VIDEO_ID_RE = re.compile(r'/video/(\d+)')
+ITEM_ID_RE = re.compile(r'(\d{19})')
+
+_ROUTER_DATA_FLAG = b'window._ROUTER_DATA = '
+_SCRIPT_END = b'</script>'
+_JSON_DECODER = json.JSONDecoder()
+
 
 class DouyinParser(BaseVideoParser):
 
+    LINK_HINT_PATTERN = r"douyin\.com"
+
     def __init__(self):
         """初始化抖音解析器"""
         super().__init__("douyin")
         self.headers = {
-            'User-Agent': (
-                'Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) '
-                'Chrome/116.0.0.0 Mobile Safari/537.36'
-            ),
+            'User-Agent': MOBILE_USER_AGENT,
             'Referer': (
                 'https://www.douyin.com/?is_from_mobile_home=1&recommend=1'
             )
@@ -64,36 +97,38 @@ class DouyinParser(BaseVideoParser):
         """
         result_links_set = set()
         seen_ids = set()
+        note_ids = []
+        video_ids = []
+        web_ids = []
         
-        mobile_pattern = r'https?://v\.douyin\.com/[^\s]+'
-        mobile_links = re.findall(mobile_pattern, text)
-        result_links_set.update(mobile_links)
+        for match in DOUYIN_LINK_RE.finditer(text):
+            kind = match.lastgroup
+            if kind == 'mobile':
+                result_links_set.add(match.group('mobile'))
+            elif kind == 'note':
+                note_ids.append(match.group('note'))
+            elif kind == 'video':
+                video_ids.append(match.group('video'))
+            else:
+                matched_url = match.group(0)
+                if '/note/' not in matched_url and '/video/' not in matched_url:
+                    web_ids.append(match.group('web'))
         
-        note_pattern = r'https?://(?:www\.)?douyin\.com/note/(\d+)'
-        note_matches = re.finditer(note_pattern, text)
-        for match in note_matches:
-            note_id = match.group(1)
+        # 同一ID按 笔记 > 视频 > 网页链接 的优先级只保留一个
+        for note_id in note_ids:
             if note_id not in seen_ids:
                 seen_ids.add(note_id)
                 result_links_set.add(f"https://www.douyin.com/note/{note_id}")
         
-        video_pattern = r'https?://(?:www\.)?douyin\.com/video/(\d+)'
-        video_matches = re.finditer(video_pattern, text)
-        for match in video_matches:
-            video_id = match.group(1)
+        for video_id in video_ids:
             if video_id not in seen_ids:
                 seen_ids.add(video_id)
                 result_links_set.add(f"https://www.douyin.com/video/{video_id}")
         
-        web_pattern = r'https?://(?:www\.)?douyin\.com/[^\s]*?(\d{19})[^\s]*'
-        web_matches = re.finditer(web_pattern, text)
-        for match in web_matches:
-            item_id = match.group(1)
+        for item_id in web_ids:
             if item_id not in seen_ids:
-                matched_url = match.group(0)
-                if '/note/' not in matched_url and '/video/' not in matched_url:
-                    seen_ids.add(item_id)
-                    result_links_set.add(f"https://www.douyin.com/video/{item_id}")
+                seen_ids.add(item_id)
+                result_links_set.add(f"https://www.douyin.com/video/{item_id}")
         
         result = list(result_links_set)
         if result:
@@ -102,33 +137,35 @@ class DouyinParser(BaseVideoParser):
             logger.debug(f"[{self.name}] extract_links: 未提取到链接")
         return result
 
-    def extract_router_data(self, text: str) -> Optional[str]:
-        """从HTML中提取ROUTER_DATA
+    def extract_router_data(self, content: bytes) -> Optional[Dict[str, Any]]:
+        """从HTML中提取并解析ROUTER_DATA
+
+        在原始字节中定位标记与所在 <script> 的结尾，只解码这一段，不把整页
+        HTML解码为字符串；再从左花括号处用 JSONDecoder.raw_decode 解析，
+        由C实现的解码器确定对象结束位置。\\u002F、\\/ 等转义由JSON解码本身
+        还原为 '/'。
 
         Args:
-            text: HTML文本
+            content: HTML响应体（UTF-8字节）
 
         Returns:
-            ROUTER_DATA JSON字符串，未找到时为None
+            ROUTER_DATA 解析后的字典，未找到或解析失败时为None
         """
-        start_flag = 'window._ROUTER_DATA = '
-        start_idx = text.find(start_flag)
+        start_idx = content.find(_ROUTER_DATA_FLAG)
         if start_idx == -1:
             return None
-        brace_start = text.find('{', start_idx)
+        brace_start = content.find(b'{', start_idx + len(_ROUTER_DATA_FLAG))
         if brace_start == -1:
             return None
-        i = brace_start
-        stack = []
-        while i < len(text):
-            if text[i] == '{':
-                stack.append('{')
-            elif text[i] == '}':
-                stack.pop()
-                if not stack:
-                    return text[brace_start:i+1]
-            i += 1
-        return None
+        end_idx = content.find(_SCRIPT_END, brace_start)
+        if end_idx == -1:
+            end_idx = len(content)
+        text = content[brace_start:end_idx].decode('utf-8', errors='replace')
+        try:
+            data, _ = _JSON_DECODER.raw_decode(text)
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
 
     async def fetch_video_info(
         self,
@@ -152,17 +189,8 @@ class DouyinParser(BaseVideoParser):
             url = f'https://www.iesdouyin.com/share/video/{item_id}/'
         try:
             async with session.get(url, headers=self.headers) as response:
-                response_text = await response.text()
-                json_str = self.extract_router_data(response_text)
-                if not json_str:
-                    return None
-                json_str = json_str.replace('\\u002F', '/').replace(
-                    '\\/',
-                    '/'
-                )
-                try:
-                    json_data = json.loads(json_str)
-                except Exception:
+                json_data = self.extract_router_data(await response.read())
+                if not json_data:
                     return None
                 loader_data = json_data.get('loaderData', {})
                 video_info = None
@@ -296,9 +324,9 @@ class DouyinParser(BaseVideoParser):
             note_id = None
             if is_note:
                 logger.debug(f"[{self.name}] parse: 检测到笔记类型")
-                note_match = re.search(r'/note/(\d+)', redirected_url)
+                note_match = NOTE_ID_RE.search(redirected_url)
                 if not note_match:
-                    note_match = re.search(r'/note/(\d+)', url)
+                    note_match = NOTE_ID_RE.search(url)
                 if note_match:
                     note_id = note_match.group(1)
                     result = await self.fetch_video_info(
@@ -309,7 +337,7 @@ class DouyinParser(BaseVideoParser):
                 else:
                     raise RuntimeError(f"无法解析此URL: {url}")
             else:
-                video_match = re.search(r'/video/(\d+)', redirected_url)
+                video_match = VIDEO_ID_RE.search(redirected_url)
                 if video_match:
                     video_id = video_match.group(1)
                     result = await self.fetch_video_info(
@@ -318,7 +346,7 @@ class DouyinParser(BaseVideoParser):
                         is_note=False
                     )
                 else:
-                    match = re.search(r'(\d{19})', redirected_url)
+                    match = ITEM_ID_RE.search(redirected_url)
                     if match:
                         item_id = match.group(1)
                         result = await self.fetch_video_info(
@@ -347,22 +375,8 @@ class DouyinParser(BaseVideoParser):
             else:
                 display_url = url
             
-            user_agent = (
-                'Mozilla/5.0 (Linux; Android 8.0.0; SM-G955U Build/R16NW) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) '
-                'Chrome/116.0.0.0 Mobile Safari/537.36'
-            )
-            referer = "https://www.douyin.com/"
-            image_headers = build_request_headers(
-                is_video=False,
-                referer=referer,
-                user_agent=user_agent
-            )
-            video_headers = build_request_headers(
-                is_video=True,
-                referer=referer,
-                user_agent=user_agent
-            )
+            image_headers = dict(_IMAGE_HEADERS)
+            video_headers = dict(_VIDEO_HEADERS)
 
             if is_gallery:
                 logger.debug(f"[{self.name}] parse: 检测到图片集，共{len(image_url_lists)}张图片")
@@ -26,10 +26,14 @@ MOBILE_HEADERS = {
     'Connection': 'keep-alive',
     'Upgrade-Insecure-Requests': '1'
 }
+SHORT_LINK_RE = re.compile(r'https?://v\.kuaishou\.com/[^\s]+')
+LONG_LINK_RE = re.compile(r'https?://(?:www\.)?kuaishou\.com/[^\s]+')
 
 
 class KuaishouParser(BaseVideoParser):
 
+    LINK_HINT_PATTERN = r"kuaishou\.com"
+
     def __init__(self):
         """初始化快手解析器"""
         super().__init__("kuaishou")
@@ -66,12 +70,10 @@ class KuaishouParser(BaseVideoParser):
         """
         result_links_set = set()
         
-        short_pattern = r'https?://v\.kuaishou\.com/[^\s]+'
-        short_links = re.findall(short_pattern, text)
+        short_links = SHORT_LINK_RE.findall(text)
         result_links_set.update(short_links)
         
-        long_pattern = r'https?://(?:www\.)?kuaishou\.com/[^\s]+'
-        long_links = re.findall(long_pattern, text)
+        long_links = LONG_LINK_RE.findall(text)
         result_links_set.update(long_links)
         
         result = list(result_links_set)
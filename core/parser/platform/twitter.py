@@ -15,9 +15,19 @@ from .base import BaseVideoParser
 from ..utils import build_request_headers
 from ...constants import Config
 
+STATUS_ID_RE = re.compile(r'/status/(\d+)')
+TWEET_LINK_RE = re.compile(
+    r'https?://(?:twitter\.com|x\.com)/'
+    r'[^\s]*?status/(\d+)[^\s<>"\'()]*',
+    re.IGNORECASE
+)
+TWITTER_ORIGIN_RE = re.compile(r'https?://(?:twitter\.com|x\.com)', re.IGNORECASE)
+
 
 class TwitterParser(BaseVideoParser):
 
+    LINK_HINT_PATTERN = r"(?:twitter|x)\.com"
+
     def __init__(
         self,
         use_parse_proxy: bool = False,
@@ -89,7 +99,7 @@ class TwitterParser(BaseVideoParser):
             return False
         url_lower = url.lower()
         if 'twitter.com' in url_lower or 'x.com' in url_lower:
-            if re.search(r'/status/(\d+)', url):
+            if STATUS_ID_RE.search(url):
                 logger.debug(f"[{self.name}] can_parse: 匹配Twitter链接 {url}")
                 return True
         logger.debug(f"[{self.name}] can_parse: 无法解析 {url}")
@@ -106,21 +116,14 @@ class TwitterParser(BaseVideoParser):
         """
         result_links_set = set()
         seen_ids = set()
-        pattern = (
-            r'https?://(?:twitter\.com|x\.com)/'
-            r'[^\s]*?status/(\d+)[^\s<>"\'()]*'
-        )
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
+        for match in TWEET_LINK_RE.finditer(text):
             tweet_id = match.group(1)
             if tweet_id not in seen_ids:
                 seen_ids.add(tweet_id)
                 original_url = match.group(0)
-                standardized_url = re.sub(
-                    r'https?://(?:twitter\.com|x\.com)',
+                standardized_url = TWITTER_ORIGIN_RE.sub(
                     'https://x.com',
-                    original_url,
-                    flags=re.IGNORECASE
+                    original_url
                 )
                 result_links_set.add(standardized_url)
         result = list(result_links_set)
@@ -240,7 +243,7 @@ class TwitterParser(BaseVideoParser):
             RuntimeError: 当解析失败时
         """
         async with self.semaphore:
-            tweet_id_match = re.search(r'/status/(\d+)', url)
+            tweet_id_match = STATUS_ID_RE.search(url)
             if not tweet_id_match:
                 raise RuntimeError(f"无法解析此URL: {url}")
             tweet_id = tweet_id_match.group(1)
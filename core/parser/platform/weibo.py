@@ -15,9 +15,19 @@ except ImportError:
 from .base import BaseVideoParser
 from ..utils import build_request_headers
 
+WEIBO_LINK_RES = tuple(re.compile(pattern) for pattern in (
+    r'https?://weibo\.com/\d+/[A-Za-z0-9]+',
+    r'https?://weibo\.cn/status/\d+',
+    r'https?://m\.weibo\.cn/detail/\d+',
+    r'https?://video\.weibo\.com/show\?fid=[\d:]+',
+    r'https?://weibo\.com/tv/show/[\d:]+',
+))
+
 
 class WeiboParser(BaseVideoParser):
 
+    LINK_HINT_PATTERN = r"weibo\.c(?:om|n)"
+
     URL_PATTERNS = {
         'weibo_com': [
             r'weibo\.com/\d+/[A-Za-z0-9]+',
@@ -32,6 +42,12 @@ class WeiboParser(BaseVideoParser):
         ],
     }
 
+    # 预编译的 URL_PATTERNS：(链接类型, 正则元组)
+    _URL_PATTERN_RES = tuple(
+        (url_type, tuple(re.compile(pattern) for pattern in patterns))
+        for url_type, patterns in URL_PATTERNS.items()
+    )
+
     def __init__(self):
         """初始化微博解析器"""
         super().__init__("weibo")
@@ -45,10 +61,11 @@ class WeiboParser(BaseVideoParser):
         Returns:
             是否可以解析
         """
-        all_patterns = []
-        for patterns in self.URL_PATTERNS.values():
-            all_patterns.extend(patterns)
-        result = any(re.search(pattern, url) for pattern in all_patterns)
+        result = any(
+            pattern.search(url)
+            for _, patterns in self._URL_PATTERN_RES
+            for pattern in patterns
+        )
         if result:
             logger.debug(f"[{self.name}] can_parse: 匹配微博链接 {url}")
         else:
@@ -64,16 +81,9 @@ class WeiboParser(BaseVideoParser):
         Returns:
             提取到的微博链接列表
         """
-        patterns = [
-            r'https?://weibo\.com/\d+/[A-Za-z0-9]+',
-            r'https?://weibo\.cn/status/\d+',
-            r'https?://m\.weibo\.cn/detail/\d+',
-            r'https?://video\.weibo\.com/show\?fid=[\d:]+',
-            r'https?://weibo\.com/tv/show/[\d:]+',
-        ]
         links = []
-        for pattern in patterns:
-            links.extend(re.findall(pattern, text))
+        for pattern in WEIBO_LINK_RES:
+            links.extend(pattern.findall(text))
         return list(set(links))
 
     def _get_url_type(self, url: str) -> str:
@@ -88,8 +98,8 @@ class WeiboParser(BaseVideoParser):
         Raises:
             ValueError: 无法识别的URL类型
         """
-        for url_type, patterns in self.URL_PATTERNS.items():
-            if any(re.search(pattern, url) for pattern in patterns):
+        for url_type, patterns in self._URL_PATTERN_RES:
+            if any(pattern.search(url) for pattern in patterns):
                 return url_type
         raise ValueError(f"无法识别的URL类型: {url}")
 
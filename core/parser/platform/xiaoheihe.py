@@ -22,10 +22,35 @@ UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
+NORMALIZE_RE = re.compile(r"(?<=\d)%|(?<=\d)h\b|#(?=\d)|￥", re.I)
+NORMALIZE_REPL = {"%": " %", "h": " h", "#": "# ", "￥": "¥ "}
+MULTISPACE_RE = re.compile(r"\s{2,}")
+APP_LINK_RE = re.compile(
+    r"https?://api\.xiaoheihe\.cn/game/share_game_detail[^\s<>\"'()]+", re.I
+)
+WEB_LINK_RE = re.compile(r"https?://(?:www\.)?xiaoheihe\.cn/[^\s<>\"'()]+", re.I)
+# 仅转换 ASCII 大写字母，保证转换前后字符串长度与下标一致
+ASCII_LOWER_TABLE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+INTRO_NEWLINE_RE = re.compile(r"[ \t]*\n[ \t\n]*")
+INTRO_SENTENCE_RE = re.compile(
+    r"[。！？]\s+(?=[\u4e00-\u9fffA-Za-z0-9])|。(?=探索|复仇雪耻)"
+)
+GAME_SCORE_KEYS = frozenset((
+    "about_the_game",
+    "name",
+    "name_en",
+    "price",
+    "heybox_price",
+    "user_num",
+    "game_award",
+))
 
 
 class XiaoheiheParser(BaseVideoParser):
 
+    LINK_HINT_PATTERN = r"xiaoheihe\.cn"
+    _TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+
     def __init__(
         self,
         use_video_proxy: bool = False,
@@ -40,7 +65,8 @@ class XiaoheiheParser(BaseVideoParser):
         super().__init__("xiaoheihe")
         self.use_video_proxy = use_video_proxy
         self.proxy_url = proxy_url
-        self.semaphore = asyncio.Semaphore(Config.PARSER_MAX_CONCURRENT)
+        # 每次解析依次请求 www 页面与 api 接口，按单站点上限限制并发，避免集中请求触发限流
+        self.semaphore = asyncio.Semaphore(Config.PARSER_MAX_CONCURRENT_PER_HOST)
         self._default_headers = {
             "User-Agent": UA,
             "Referer": "https://www.xiaoheihe.cn/",
@@ -103,11 +129,8 @@ class XiaoheiheParser(BaseVideoParser):
         """
         candidates = set()
 
-        app_pattern = r"https?://api\.xiaoheihe\.cn/game/share_game_detail[^\s<>\"'()]+"
-        candidates.update(re.findall(app_pattern, text, re.IGNORECASE))
-
-        web_pattern = r"https?://(?:www\.)?xiaoheihe\.cn/[^\s<>\"'()]+"
-        candidates.update(re.findall(web_pattern, text, re.IGNORECASE))
+        candidates.update(APP_LINK_RE.findall(text))
+        candidates.update(WEB_LINK_RE.findall(text))
 
         result: List[str] = []
         for u in candidates:
@@ -257,7 +280,7 @@ class XiaoheiheParser(BaseVideoParser):
         async with session.get(
             api_url,
             headers={**self._default_headers, "Accept": "application/json"},
-            timeout=aiohttp.ClientTimeout(total=15),
+            timeout=self._TIMEOUT,
         ) as resp:
             if resp.status != 200:
                 return None
@@ -309,31 +332,111 @@ class XiaoheiheParser(BaseVideoParser):
         async with session.get(
             url,
             headers=self._default_headers,
-            timeout=aiohttp.ClientTimeout(total=15),
+            timeout=self._TIMEOUT,
         ) as response:
             if response.status != 200:
                 raise RuntimeError(f"无法获取页面内容，状态码: {response.status}")
             return await response.text()
 
-    def _extract_nuxt_data_payload(self, html: str) -> Optional[list]:
+    @staticmethod
+    def _locate_nuxt_script(html: str) -> Optional[Tuple[int, int, int]]:
+        """定位 `__NUXT_DATA__` script 标签在 HTML 中的位置。
+
+        Args:
+            html: 页面 HTML。
+
+        Returns:
+            三元组 (标签起始位置, 内容起始位置, 内容结束位置)；未找到返回 None。
+        """
+        if not html:
+            return None
+        marker = html.find('id="__NUXT_DATA__"')
+        if marker < 0:
+            return None
+        tag_start = html.rfind("<script", 0, marker)
+        if tag_start < 0 or html.find(">", tag_start, marker) >= 0:
+            return None
+        content_start = html.find(">", marker)
+        if content_start < 0:
+            return None
+        content_start += 1
+        content_end = html.find("</script>", content_start)
+        if content_end < 0:
+            return None
+        return tag_start, content_start, content_end
+
+    @staticmethod
+    def _find_m3u8_urls(html: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """在 HTML 的指定区间内查找 m3u8 直链。
+
+        以字面量 `.m3u8` 为锚点用 `str.find` 定位，再向两侧扩展到 URL 边界，
+        避免正则在整页（含大段 Nuxt JSON）上逐字符匹配。锚点与协议头在
+        ASCII 小写化的副本上查找（不区分大小写），结果从原文截取。
+
+        Args:
+            html: 页面 HTML。
+            start: 区间起始位置。
+            end: 区间结束位置（不含），默认到文本末尾。
+
+        Returns:
+            按出现顺序排列的 m3u8 URL 列表（未去重）。
+        """
+        if end is None:
+            end = len(html)
+
+        def is_delim(c: str) -> bool:
+            return c in "\"'<>" or c.isspace()
+
+        lowered = html.translate(ASCII_LOWER_TABLE)
+        urls: List[str] = []
+        pos = start
+        while True:
+            i = lowered.find(".m3u8", pos, end)
+            if i < 0:
+                break
+            left = i
+            while left > start and not is_delim(html[left - 1]):
+                left -= 1
+            right = i + 5
+            while right < end and not is_delim(html[right]):
+                right += 1
+            pos = right
+
+            token = lowered[left:right]
+            hits = [h for h in (token.find("http://"), token.find("https://")) if h >= 0]
+            if not hits:
+                continue
+            url_start = min(hits)
+            suffix = token.rfind(".m3u8")
+            if suffix <= token.find("://", url_start) + 3:
+                continue
+            url_end = suffix + 5
+            if token.startswith("?", url_end):
+                url_end = len(token)
+            urls.append(html[left + url_start:left + url_end])
+        return urls
+
+    def _extract_nuxt_data_payload(
+        self,
+        html: str,
+        span: Optional[Tuple[int, int, int]] = None
+    ) -> Optional[list]:
         """从 HTML 中提取 Nuxt 注入的 `__NUXT_DATA__` JSON payload。
 
         Args:
             html: 页面 HTML。
+            span: `_locate_nuxt_script` 的结果，未提供时自动定位。
 
         Returns:
             解析成功时返回 list payload，否则 None。
         """
         if not html:
             return None
-        m = re.search(
-            r'<script[^>]+id="__NUXT_DATA__"[^>]*>(.*?)</script>',
-            html,
-            re.S | re.I,
-        )
-        if not m:
+        if span is None:
+            span = self._locate_nuxt_script(html)
+        if not span:
             return None
-        raw = m.group(1).strip()
+        raw = html[span[1]:span[2]].strip()
         try:
             data = json.loads(raw)
         except Exception:
@@ -408,37 +511,26 @@ class XiaoheiheParser(BaseVideoParser):
             return None
         best: Optional[Dict[str, Any]] = None
         best_score = -1
+        container = (dict, list)
         stack = [root]
+        pop = stack.pop
+        extend = stack.extend
         while stack:
-            cur = stack.pop()
+            cur = pop()
             if isinstance(cur, dict):
-                if cur.get("appid") == appid or cur.get("steam_appid") == appid:
-                    score = 0
-                    for k in (
-                        "about_the_game",
-                        "name",
-                        "name_en",
-                        "price",
-                        "heybox_price",
-                        "user_num",
-                        "game_award",
-                    ):
-                        if k in cur:
-                            score += 3
+                steam_match = cur.get("steam_appid") == appid
+                if steam_match or cur.get("appid") == appid:
+                    score = 3 * len(cur.keys() & GAME_SCORE_KEYS)
                     if "comment_stats" in cur:
                         score += 2
-                    if cur.get("steam_appid") == appid:
+                    if steam_match:
                         score += 2
                     if score > best_score:
                         best = cur
                         best_score = score
-                for v in cur.values():
-                    if isinstance(v, (dict, list)):
-                        stack.append(v)
+                extend(v for v in cur.values() if isinstance(v, container))
             elif isinstance(cur, list):
-                for v in cur:
-                    if isinstance(v, (dict, list)):
-                        stack.append(v)
+                extend(v for v in cur if isinstance(v, container))
         return best
 
     @staticmethod
@@ -468,12 +560,8 @@ class XiaoheiheParser(BaseVideoParser):
         if not text:
             return ""
         v = str(text).strip()
-        v = re.sub(r"(\d)\%", r"\1 %", v)
-        v = re.sub(r"(\d)h\b", r"\1 h", v, flags=re.I)
-        v = re.sub(r"#(\d)", r"# \1", v)
-        v = v.replace("￥", "¥ ")
-        v = re.sub(r"\s{2,}", " ", v).strip()
-        return v
+        v = NORMALIZE_RE.sub(lambda m: NORMALIZE_REPL[m.group(0).lower()], v)
+        return MULTISPACE_RE.sub(" ", v).strip()
 
     @staticmethod
     def _extract_rich_text(it: Any) -> str:
@@ -516,14 +604,11 @@ class XiaoheiheParser(BaseVideoParser):
         t = self._strip_tags(text)
         t = t.replace("\u3000", " ").replace("\xa0", " ")
         if "\n" in t:
-            t = re.sub(r"[ \t]+\n", "\n", t)
-            t = re.sub(r"\n[ \t]+", "\n", t)
-            t = re.sub(r"\n{3,}", "\n\n", t).strip()
-            return t
-        t = re.sub(r"([。！？])\s+(?=[\u4e00-\u9fffA-Za-z0-9])", r"\1\n\n", t)
-        t = re.sub(r"。(?=(探索|复仇雪耻))", "。\n\n", t)
-        t = re.sub(r"\n{3,}", "\n\n", t).strip()
-        return t
+            return INTRO_NEWLINE_RE.sub(
+                lambda m: "\n" if m.group(0).count("\n") == 1 else "\n\n",
+                t
+            ).strip()
+        return INTRO_SENTENCE_RE.sub(lambda m: m.group(0)[0] + "\n\n", t).strip()
 
     def _parse_types_from_html(self, html: str) -> str:
         """从页面 HTML 中解析“类型/标签”文本。
@@ -595,10 +680,8 @@ class XiaoheiheParser(BaseVideoParser):
 
             html = await self._fetch_html(web_url, session)
 
-            videos = self._unique_keep_order(re.findall(
-                r"https?://[^\"'\s<>]+\.m3u8(?:\?[^\"'\s<>]*)?",
-                html, re.I
-            ))
+            nuxt_span = self._locate_nuxt_script(html)
+            videos = self._unique_keep_order(self._find_m3u8_urls(html))
             all_images = re.findall(
                 r"https?://[^\"'\s<>]+\.(?:jpg|jpeg|png|webp)(?:\?[^\"'\s<>]*)?",
                 html, re.I
@@ -613,7 +696,7 @@ class XiaoheiheParser(BaseVideoParser):
 
             types = self._parse_types_from_html(html)
 
-            payload = self._extract_nuxt_data_payload(html)
+            payload = self._extract_nuxt_data_payload(html, nuxt_span)
             if not payload:
                 raise RuntimeError("未找到 __NUXT_DATA__，无法解析统计/价格/奖项")
             root = self._devalue_resolve_root(payload)
@@ -621,15 +704,21 @@ class XiaoheiheParser(BaseVideoParser):
             if not game:
                 raise RuntimeError("未找到游戏详情数据（Nuxt 解析失败）")
 
-            name = game.get("name") if isinstance(game.get("name"), str) else ""
-            name_en = game.get("name_en") if isinstance(game.get("name_en"), str) else ""
+            gv = game.get
+            name = gv("name")
+            name = name if isinstance(name, str) else ""
+            name_en = gv("name_en")
+            name_en = name_en if isinstance(name_en, str) else ""
             title = f"{name}（{name_en}）" if (name and name_en) else (name or name_en)
             if not title:
                 raise RuntimeError("未解析到游戏标题")
 
-            score = str(game.get("score")).strip() if isinstance(game.get("score"), str) else ""
+            score = gv("score")
+            score = score.strip() if isinstance(score, str) else ""
             score_count = ""
-            comment_stats = game.get("comment_stats") if isinstance(game.get("comment_stats"), dict) else {}
+            comment_stats = gv("comment_stats")
+            if not isinstance(comment_stats, dict):
+                comment_stats = {}
             score_comment = comment_stats.get("score_comment")
             if isinstance(score_comment, int):
                 score_count = self._format_people_count(score_comment)
@@ -639,7 +728,7 @@ class XiaoheiheParser(BaseVideoParser):
                 if score_count:
                     rating_line = f"小黑盒评分：{score}（{score_count}）"
 
-            steam_appid = game.get("steam_appid")
+            steam_appid = gv("steam_appid")
             if isinstance(steam_appid, str) and steam_appid.isdigit():
                 steam_appid = int(steam_appid)
             if not isinstance(steam_appid, int) or steam_appid <= 0:
@@ -668,13 +757,13 @@ class XiaoheiheParser(BaseVideoParser):
                         vals.append(p.get("value"))
                 publisher = ",".join(vals)
 
-            stats_map: Dict[str, Dict[str, Any]] = {}
-            if isinstance(game.get("user_num"), dict):
-                gd = game["user_num"].get("game_data")
-                if isinstance(gd, list):
-                    for it in gd:
-                        if isinstance(it, dict) and isinstance(it.get("desc"), str):
-                            stats_map[it["desc"]] = it
+            user_num = gv("user_num")
+            gd = user_num.get("game_data") if isinstance(user_num, dict) else None
+            stats_map: Dict[str, Dict[str, Any]] = {
+                it["desc"]: it
+                for it in gd
+                if isinstance(it, dict) and isinstance(it.get("desc"), str)
+            } if isinstance(gd, list) else {}
 
             def stat_line(desc_key: str, out_label: str, include_rank: bool = False) -> str:
                 it = stats_map.get(desc_key)
@@ -702,18 +791,19 @@ class XiaoheiheParser(BaseVideoParser):
             price_line = ""
             current_price_line = ""
             lowest_price_line = ""
-            if isinstance(game.get("price"), dict):
-                p = game["price"]
-                initial = p.get("initial") or p.get("current")
+            p = gv("price")
+            if isinstance(p, dict):
+                pget = p.get
+                initial = pget("initial") or pget("current")
                 if initial:
                     price_line = f"价格：¥ {self._normalize_value_text(initial).replace('¥ ', '').replace('¥', '').strip()}"
-                lp = p.get("lowest_price")
+                lp = pget("lowest_price")
                 if lp:
                     lowest_price_line = (
                         f"史低价格：¥ {self._normalize_value_text(lp).replace('¥ ', '').replace('¥', '').strip()}"
                     )
-            if isinstance(game.get("heybox_price"), dict):
-                hp = game["heybox_price"]
+            hp = gv("heybox_price")
+            if isinstance(hp, dict):
                 cost_coin = hp.get("cost_coin")
                 if cost_coin is not None:
                     yuan = self._format_yuan_from_coin(cost_coin)
@@ -728,8 +818,9 @@ class XiaoheiheParser(BaseVideoParser):
                     lowest_price_line = f"史低价格：¥ {v}"
 
             awards: List[str] = []
-            if isinstance(game.get("game_award"), list):
-                for it in game["game_award"]:
+            game_award = gv("game_award")
+            if isinstance(game_award, list):
+                for it in game_award:
                     if isinstance(it, dict):
                         desc = self._clean_award_text(it.get("desc"))
                         detail = self._clean_award_text(it.get("detail_name"))
@@ -29,10 +29,18 @@ PC_UA = (
     "AppleWebKit/537.36 (KHTML, like Gecko) "
     "Chrome/142.0.0.0 Safari/537.36 Edg/142.0.0.0"
 )
+SHORT_LINK_RE = re.compile(r'https?://xhslink\.com/[^\s<>"\'()]+', re.IGNORECASE)
+LONG_LINK_RE = re.compile(
+    r'https?://(?:www\.)?xiaohongshu\.com/'
+    r'(?:explore|discovery/item)/[^\s<>"\'()]+',
+    re.IGNORECASE
+)
 
 
 class XiaohongshuParser(BaseVideoParser):
 
+    LINK_HINT_PATTERN = r"xhslink\.com|xiaohongshu\.com"
+
     def __init__(self):
         """初始化小红书解析器"""
         super().__init__("xiaohongshu")
@@ -71,19 +79,14 @@ class XiaohongshuParser(BaseVideoParser):
         result_links_set = set()
         seen_urls = set()
         
-        short_pattern = r'https?://xhslink\.com/[^\s<>"\'()]+'
-        short_links = re.findall(short_pattern, text, re.IGNORECASE)
+        short_links = SHORT_LINK_RE.findall(text)
         for link in short_links:
             normalized = link.lower()
             if normalized not in seen_urls:
                 seen_urls.add(normalized)
                 result_links_set.add(link)
         
-        long_pattern = (
-            r'https?://(?:www\.)?xiaohongshu\.com/'
-            r'(?:explore|discovery/item)/[^\s<>"\'()]+'
-        )
-        long_links = re.findall(long_pattern, text, re.IGNORECASE)
+        long_links = LONG_LINK_RE.findall(text)
         for link in long_links:
             normalized = link.lower()
             if normalized not in seen_urls:
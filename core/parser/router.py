@@ -1,4 +1,5 @@
-from typing import List, Tuple
+import re
+from typing import List, Optional, Sequence, Tuple
 
 try:
     from astrbot.api import logger
@@ -12,18 +13,57 @@ from .utils import is_live_url
 
 class LinkRouter:
 
-    def __init__(self, parsers: List[BaseVideoParser]):
+    def __init__(self, parsers: Sequence[BaseVideoParser]):
         """初始化链接清洗分流器
 
         Args:
-            parsers: 解析器列表
+            parsers: 解析器序列（保存为只读元组快照）
 
         Raises:
             ValueError: 当parsers参数为空时
         """
         if not parsers:
             raise ValueError("parsers 参数不能为空")
-        self.parsers = parsers
+        self.parsers = tuple(parsers)
+        self._hint_re = self._build_hint_pattern(self.parsers)
+
+    @staticmethod
+    def _build_hint_pattern(
+        parsers: Sequence[BaseVideoParser]
+    ) -> Optional[re.Pattern]:
+        """将各解析器的链接线索合并为一个带命名分组的正则
+
+        Args:
+            parsers: 解析器序列
+
+        Returns:
+            合并后的正则，没有任何解析器提供线索时为None
+        """
+        parts = [
+            f"(?P<p{idx}>{parser.LINK_HINT_PATTERN})"
+            for idx, parser in enumerate(parsers)
+            if parser.LINK_HINT_PATTERN
+        ]
+        if not parts:
+            return None
+        return re.compile("|".join(parts), re.IGNORECASE)
+
+    def _select_parsers(self, text: str) -> List[BaseVideoParser]:
+        """单次扫描文本，筛选出可能提取到链接的解析器
+
+        Args:
+            text: 输入文本
+
+        Returns:
+            候选解析器列表（保持原有顺序），未提供线索的解析器总是包含在内
+        """
+        if self._hint_re is None:
+            return list(self.parsers)
+        hinted = {match.lastgroup for match in self._hint_re.finditer(text)}
+        return [
+            parser for idx, parser in enumerate(self.parsers)
+            if not parser.LINK_HINT_PATTERN or f"p{idx}" in hinted
+        ]
 
     def extract_links_with_parser(
         self,
@@ -42,7 +82,7 @@ class LinkRouter:
             return []
 
         links_with_position = []
-        for parser in self.parsers:
+        for parser in self._select_parsers(text):
             links = parser.extract_links(text)
             if links:
                 logger.debug(f"解析器 {parser.name} 提取到 {len(links)} 个链接")
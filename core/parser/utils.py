@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from types import MappingProxyType
 from urllib.parse import parse_qs, unquote, urlparse
 
 
@@ -7,6 +8,29 @@ class SkipParse(Exception):
     pass
 
 
+_DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/120.0.0.0 Safari/537.36'
+)
+_DEFAULT_ACCEPT_LANGUAGE = 'zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7'
+
+# 媒体请求头模板（只读），build_request_headers 每次复制一份后再叠加 Referer 等字段
+_VIDEO_HEADER_TEMPLATE = MappingProxyType({
+    'User-Agent': _DEFAULT_USER_AGENT,
+    'Accept': '*/*',
+    'Accept-Language': _DEFAULT_ACCEPT_LANGUAGE,
+})
+_IMAGE_HEADER_TEMPLATE = MappingProxyType({
+    'User-Agent': _DEFAULT_USER_AGENT,
+    'Accept': (
+        'image/avif,image/webp,image/apng,image/svg+xml,'
+        'image/*,*/*;q=0.8'
+    ),
+    'Accept-Language': _DEFAULT_ACCEPT_LANGUAGE,
+})
+
+
 def _ensure_url_has_scheme(url: str) -> str:
     """确保URL带有scheme，便于urlparse正确解析hostname。"""
     if not url:
@@ -94,32 +118,11 @@ def build_request_headers(
     else:
         referer_url = referer if referer else (default_referer or '')
     
+    headers = dict(
+        _VIDEO_HEADER_TEMPLATE if is_video else _IMAGE_HEADER_TEMPLATE
+    )
     if user_agent:
-        effective_user_agent = user_agent
-    else:
-        effective_user_agent = (
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-            'AppleWebKit/537.36 (KHTML, like Gecko) '
-            'Chrome/120.0.0.0 Safari/537.36'
-        )
-    
-    default_accept_language = 'zh-CN,zh;q=0.9,en-US;q=0.8,en;q=0.7'
-    
-    if is_video:
-        headers = {
-            'User-Agent': effective_user_agent,
-            'Accept': '*/*',
-            'Accept-Language': default_accept_language,
-        }
-    else:
-        headers = {
-            'User-Agent': effective_user_agent,
-            'Accept': (
-                'image/avif,image/webp,image/apng,image/svg+xml,'
-                'image/*,*/*;q=0.8'
-            ),
-            'Accept-Language': default_accept_language,
-        }
+        headers['User-Agent'] = user_agent
     
     if referer_url:
         headers['Referer'] = referer_url
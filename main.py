@@ -1,6 +1,8 @@
 import asyncio
 import json
-from typing import Any, Dict
+import re
+import ssl
+from typing import Any, Dict, Optional
 
 import aiohttp
 
@@ -16,11 +18,21 @@ from astrbot.core.star.filter.event_message_type import EventMessageType
 
 from .core.parser import ParserManager
 from .core.downloader import DownloadManager
-from .core.file_cleaner import cleanup_files, cleanup_directory
+from .core.file_cleaner import cleanup_files_async, cleanup_directory
 from .core.constants import Config
 from .core.message_adapter import MessageManager
 from .core.config_manager import ConfigManager
 
+# 共享连接池使用的SSL上下文，进程内只创建一次
+_SSL_CONTEXT = ssl.create_default_context()
+
+# 安装了 aiodns 时使用异步DNS解析，不占用线程池执行阻塞的 getaddrinfo
+try:
+    import aiodns  # noqa: F401
+    _HAS_AIODNS = True
+except ImportError:
+    _HAS_AIODNS = False
+
 
 @register(
     "astrbot_plugin_media_parser",
@@ -48,6 +60,13 @@ class VideoParserPlugin(Star):
         self.is_auto_pack = self.config_manager.is_auto_pack
         self.is_auto_parse = self.config_manager.is_auto_parse
         self.trigger_keywords = self.config_manager.trigger_keywords
+        self._trigger_keywords_tuple = tuple(
+            dict.fromkeys(str(k) for k in self.trigger_keywords)
+        )
+        self._trigger_re = (
+            re.compile("|".join(map(re.escape, self._trigger_keywords_tuple)))
+            if len(self._trigger_keywords_tuple) > 1 else None
+        )
         self.max_video_size_mb = self.config_manager.max_video_size_mb
         self.large_video_threshold_mb = self.config_manager.large_video_threshold_mb
         self.debug_mode = self.config_manager.debug_mode
@@ -70,14 +89,43 @@ class VideoParserPlugin(Star):
         
         self.proxy_addr = self.config_manager.proxy_addr
         
-        self.message_manager = MessageManager(logger=self.logger)
+        self.message_manager = MessageManager(
+            logger=self.logger,
+            cache_dir=self.download_manager.cache_dir
+        )
+        
+        self._connector: Optional[aiohttp.TCPConnector] = None
+
+    def _get_connector(self) -> aiohttp.TCPConnector:
+        """获取插件共享的连接池
+
+        每条消息仍使用独立的 ClientSession（Cookie 等会话状态互不影响），
+        但共用同一个连接器，使对同一站点/CDN的连续请求可以复用
+        keep-alive 连接与DNS缓存，免去重复的TCP/TLS握手。
+
+        Returns:
+            TCP连接器
+        """
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=Config.HTTP_CONNECTOR_LIMIT,
+                ttl_dns_cache=Config.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=Config.HTTP_KEEPALIVE_TIMEOUT,
+                ssl=_SSL_CONTEXT,
+                resolver=aiohttp.AsyncResolver() if _HAS_AIODNS else None,
+                enable_cleanup_closed=True
+            )
+        return self._connector
 
     async def terminate(self):
         """插件终止时的清理工作"""
         await self.download_manager.shutdown()
         
+        if self._connector is not None and not self._connector.closed:
+            await self._connector.close()
+        
         if self.download_manager.cache_dir:
-            cleanup_directory(self.download_manager.cache_dir)
+            await asyncio.to_thread(cleanup_directory, self.download_manager.cache_dir)
 
     def _should_parse(self, message_str: str) -> bool:
         """判断是否应该解析消息
@@ -90,10 +138,12 @@ class VideoParserPlugin(Star):
         """
         if self.is_auto_parse:
             return True
-        for keyword in self.trigger_keywords:
-            if keyword in message_str:
-                return True
-        return False
+        keywords = self._trigger_keywords_tuple
+        if not keywords:
+            return False
+        if self._trigger_re is None:
+            return keywords[0] in message_str
+        return self._trigger_re.search(message_str) is not None
 
 
     @filter.event_message_type(EventMessageType.ALL)
@@ -172,10 +222,48 @@ class VideoParserPlugin(Star):
         sender_name, sender_id = self.message_manager.get_sender_info(event)
         
         timeout = aiohttp.ClientTimeout(total=Config.DEFAULT_TIMEOUT)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with aiohttp.ClientSession(
+            timeout=timeout,
+            connector=self._get_connector(),
+            connector_owner=False,
+            read_bufsize=Config.HTTP_READ_BUFSIZE
+        ) as session:
+            async def process_single_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+                """处理单个元数据
+
+                Args:
+                    metadata: 元数据字典
+
+                Returns:
+                    处理后的元数据字典，异常时包含error字段
+                """
+                if metadata.get('error'):
+                    return metadata
+                
+                try:
+                    processed_metadata = await self.download_manager.process_metadata(
+                        session,
+                        metadata,
+                        proxy_addr=self.proxy_addr
+                    )
+                    return processed_metadata
+                except Exception as e:
+                    self.logger.exception(f"处理元数据失败: {metadata.get('url', '')}, 错误: {e}")
+                    metadata['error'] = str(e)
+                    return metadata
+            
+            # 链接解析完成后立即开始下载/检查其媒体，与其余链接的解析重叠进行
+            prefetched: Dict[int, asyncio.Task] = {}
+
+            def start_processing(metadata: Dict[str, Any]) -> None:
+                prefetched[id(metadata)] = asyncio.create_task(
+                    process_single_metadata(metadata)
+                )
+
             metadata_list = await self.parser_manager.parse_text(
                 message_text,
-                session
+                session,
+                on_parsed=start_processing
             )
             if not metadata_list:
                 if self.debug_mode:
@@ -191,6 +279,7 @@ class VideoParserPlugin(Star):
             if not has_valid_metadata:
                 if self.debug_mode:
                     self.logger.debug("解析后未获得任何有效元数据（可能是直播链接或解析失败）")
+                await asyncio.gather(*prefetched.values(), return_exceptions=True)
                 return
                         
             if self.debug_mode:
@@ -203,31 +292,10 @@ class VideoParserPlugin(Star):
                         f"video_force_download={metadata.get('video_force_download')}"
                     )
             
-            async def process_single_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
-                """处理单个元数据
-
-                Args:
-                    metadata: 元数据字典
-
-                Returns:
-                    处理后的元数据字典，异常时包含error字段
-                """
-                if metadata.get('error'):
-                    return metadata
-                
-                try:
-                    processed_metadata = await self.download_manager.process_metadata(
-                        session,
-                        metadata,
-                        proxy_addr=self.proxy_addr
-                    )
-                    return processed_metadata
-                except Exception as e:
-                    self.logger.exception(f"处理元数据失败: {metadata.get('url', '')}, 错误: {e}")
-                    metadata['error'] = str(e)
-                    return metadata
-            
-            tasks = [process_single_metadata(metadata) for metadata in metadata_list]
+            tasks = [
+                prefetched.pop(id(metadata), None) or process_single_metadata(metadata)
+                for metadata in metadata_list
+            ]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             processed_metadata_list = []
@@ -295,6 +363,6 @@ class VideoParserPlugin(Star):
                 raise
             finally:
                 if temp_files or video_files:
-                    cleanup_files(temp_files + video_files)
+                    await cleanup_files_async(temp_files + video_files)
                     if self.debug_mode:
                         self.logger.debug(f"已清理临时文件: {len(temp_files)} 个, 视频文件: {len(video_files)} 个")
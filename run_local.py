@@ -413,6 +413,14 @@ if __name__ == "__main__":
     
     CACHE_DIR = os.path.join(os.path.dirname(__file__), "media")
     
+    # 已安装 uvloop 时使用其事件循环（Windows 不支持，保持默认）
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
+    
     asyncio.run(main(
         debug_mode=DEBUG_MODE,
         use_proxy=USE_PROXY,